@@ -1,19 +1,38 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import ParkingLocation, ParkingSlot, Reservation
+from .models import ParkingLocation, ParkingSlot, Reservation, DailyLocationStats, Task
 
 admin.site.register(ParkingLocation)
 admin.site.register(ParkingSlot)
+admin.site.register(DailyLocationStats)
 
 @admin.register(Reservation)
 class ReservationAdmin(admin.ModelAdmin):
-    list_display = ['id', 'user',  'start_time', 'end_time', 'status', 'receipt']
+    list_display = ['id', 'user',  'start_time', 'end_time', 'status', 'receipt_thumb']
     readonly_fields = ['receipt_preview']  # shows preview in detail view
 
     def receipt_preview(self, obj):
         if obj.receipt:
-            return format_html('<img src="{}" width="200" />', obj.receipt.url)
+            preview = obj.receipt_thumbnail or obj.receipt
+            return format_html(
+                '<a href="{}" target="_blank"><img src="{}" width="200" /></a>',
+                obj.receipt.url,
+                preview.url,
+            )
         return "No receipt uploaded"
 
     receipt_preview.short_description = "Receipt Preview"
 
+    def receipt_thumb(self, obj):
+        if obj.receipt_thumbnail:
+            return format_html('<img src="{}" height="40" />', obj.receipt_thumbnail.url)
+        return "-" if not obj.receipt else "Processing"
+
+    receipt_thumb.short_description = "Receipt"
+
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'attempts', 'max_attempts', 'run_after', 'updated_at']
+    list_filter = ['status', 'name']
@@ -5,10 +5,19 @@ class CoreConfig(AppConfig):
     name = 'core'
 
     def ready(self):
+        import core.signals  # noqa: F401  (registers rollup receivers)
         from django_cron import CronJobManager
-        from core.cron import OverdueReservationCronJob
+        from core.cron import (
+            OverdueReservationCronJob,
+            PruneExpiredTokensCronJob,
+            PruneExpiredUploadsCronJob,
+            PruneLiveEventsCronJob,
+        )
 
 
         self.cron_manager = CronJobManager([
             OverdueReservationCronJob,
+            PruneExpiredTokensCronJob,
+            PruneLiveEventsCronJob,
+            PruneExpiredUploadsCronJob,
         ])
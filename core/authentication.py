@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+# ------------------------------
+# Stateless JWT Authentication
+# ------------------------------
+
+# Seconds a user's account state (active, staff, superuser) is trusted before re-reading it.
+# Changes saved in this process apply at once (core/signals.py); other processes' within this TTL.
+ACCOUNT_STATE_TTL = getattr(settings, 'ACCOUNT_STATE_TTL', 30)
+# Users whose state is cached per process; the least recently used are evicted beyond this.
+ACCOUNT_STATE_MAX_ENTRIES = getattr(settings, 'ACCOUNT_STATE_MAX_ENTRIES', 10000)
+
+# Claims stamped into tokens at login (see ClaimsTokenObtainPairSerializer).
+# is_staff / is_superuser are only display hints: authorization reads them from `account_states`.
+ACCOUNT_CLAIMS = ('username', 'is_staff', 'is_superuser')
+
+AccountState = namedtuple('AccountState', ['is_active', 'is_staff', 'is_superuser'])
+UNKNOWN_ACCOUNT = AccountState(False, False, False)  # Deleted users
+
+
+def add_account_claims(token, user):
+    for claim in ACCOUNT_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class AccountStateCache:
+    """
+    Short-TTL, size-bounded (LRU) in-process map of user id -> AccountState.
+    A miss costs one indexed primary-key query; hits cost nothing.
+    """
+
+    def __init__(self, ttl=ACCOUNT_STATE_TTL, max_entries=ACCOUNT_STATE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._states = OrderedDict()  # user id -> (AccountState, expiry), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        current = time.monotonic()
+        with self._lock:
+            entry = self._states.get(user_id)
+            if entry is not None and entry[1] > current:
+                self._states.move_to_end(user_id)
+                return entry[0]
+
+        row = User.objects.filter(pk=user_id).values_list('is_active', 'is_staff', 'is_superuser').first()
+        state = AccountState(*row) if row else UNKNOWN_ACCOUNT
+        self.set(user_id, state)
+        return state
+
+    def is_active(self, user_id):
+        return self.get(user_id).is_active
+
+    def set(self, user_id, state):
+        with self._lock:
+            self._states[user_id] = (state, time.monotonic() + self.ttl)
+            self._states.move_to_end(user_id)
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._states.pop(user_id, None)
+
+    def __len__(self):
+        return len(self._states)
+
+
+account_states = AccountStateCache()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the signed token claims
+    instead of loading the User row on every request.
+
+    request.user is an unsaved User carrying only id, username, is_staff,
+    is_superuser and is_active. It works for permissions, ownership checks and
+    foreign keys; views that need the full profile must load it (see auth_views).
+    Active / staff / superuser come from `account_states`, not the token, so a
+    deactivated or demoted user loses access without waiting for the token to expire.
+    Tokens issued before these claims existed fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if 'is_staff' not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        state = account_states.get(user_id)
+        if not state.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return User(
+            id=user_id,
+            username=validated_token.get('username', ''),
+            is_staff=state.is_staff,
+            is_superuser=state.is_superuser,
+            is_active=True,
+        )
@@ -0,0 +1,96 @@
+from django.db.models import Count, Exists, OuterRef
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from core.models import ParkingSlot, Reservation
+
+# ------------------------------
+# Availability Engine
+# ------------------------------
+
+# Reservation statuses that still hold a slot for their [start_time, end_time) window.
+BLOCKING_STATUSES = ['Pending', 'Processing', 'Reserved', 'Active', 'Overdue']
+
+
+def parse_window(start, end):
+    """
+    Parse ISO-8601 start/end strings into aware datetimes.
+    Returns (start, end) or raises ValueError with a readable message.
+    """
+    if not start or not end:
+        raise ValueError("Both 'start' and 'end' are required.")
+
+    start_dt = parse_datetime(start)
+    end_dt = parse_datetime(end)
+    if start_dt is None or end_dt is None:
+        raise ValueError("'start' and 'end' must be ISO-8601 datetimes.")
+
+    if is_naive(start_dt):
+        start_dt = make_aware(start_dt)
+    if is_naive(end_dt):
+        end_dt = make_aware(end_dt)
+
+    if start_dt >= end_dt:
+        raise ValueError("'start' must be before 'end'.")
+    return start_dt, end_dt
+
+
+def overlapping_reservations(start, end):
+    """
+    Reservations whose window intersects [start, end).
+    Two half-open intervals overlap when each starts before the other ends,
+    so back-to-back bookings (one ends exactly when the next starts) do not clash.
+    Served by the (slot, start_time, end_time) composite index.
+    """
+    return Reservation.objects.filter(
+        status__in=BLOCKING_STATUSES,
+        start_time__lt=end,
+        end_time__gt=start,
+    )
+
+
+def free_slots(start, end):
+    """
+    All slots that are open for reservation and free for [start, end).
+    Runs as a single query with a correlated NOT EXISTS on the reservation index.
+    """
+    clashes = overlapping_reservations(start, end).filter(slot=OuterRef('pk'))
+    return (
+        ParkingSlot.objects
+        .filter(~Exists(clashes), is_available=True, locked=False)
+    )
+
+
+def available_slots(location_id, start, end):
+    """
+    Slots at a location that are free for [start, end).
+    """
+    return free_slots(start, end).filter(location_id=location_id)
+
+
+def free_slot_counts(location_ids, start, end):
+    """
+    Returns {location_id: free slot count} for [start, end), in one grouped query.
+    Locations with no free slots are omitted.
+    """
+    rows = (
+        free_slots(start, end)
+        .filter(location_id__in=location_ids)
+        .values('location_id')
+        .annotate(free=Count('id'))
+        .order_by()
+    )
+    return {row['location_id']: row['free'] for row in rows}
+
+
+def is_slot_available(slot, start, end, exclude_reservation=None):
+    """
+    Returns True if the slot is open and has no blocking reservation in [start, end).
+    """
+    if slot.locked or not slot.is_available:
+        return False
+
+    clashes = overlapping_reservations(start, end).filter(slot=slot)
+    if exclude_reservation is not None:
+        clashes = clashes.exclude(pk=exclude_reservation.pk)
+    return not clashes.exists()
@@ -0,0 +1,101 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+# ------------------------------
+# Versioned Read Cache
+# ------------------------------
+
+# Cached responses also expire on their own, in case a bump is ever missed.
+READ_CACHE_TIMEOUT = 300
+
+ALL_LOCATIONS = 'all'
+
+
+def version_key(scope):
+    return f"read-cache:version:{scope}"
+
+
+def get_version(scope):
+    """
+    Current version number for a scope ('all' or a location id).
+    A missing key starts at the current time in ms, so a reset never reuses an old version.
+    """
+    key = version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(scope):
+    key = version_key(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def bump_location(location_id):
+    """
+    Invalidate everything cached for one location plus the location list.
+    """
+    bump_version(location_id)
+    bump_version(ALL_LOCATIONS)
+
+
+def etag_matches(etag, if_none_match):
+    """
+    Weak comparison of `etag` against an If-None-Match header (a list of ETags or *).
+    """
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in (tag.removeprefix('W/') for tag in etags)
+
+
+class VersionedCacheMixin:
+    """
+    Read-through cache for GET on list/detail views, keyed by per-location versions.
+    Responses carry an ETag; a matching If-None-Match returns 304 with no body.
+    cache_scope_kwarg names the URL kwarg holding the location the response depends
+    on; left as None, the response depends on every location (ALL_LOCATIONS).
+    """
+    cache_scope_kwarg = None
+
+    def get_cache_scopes(self):
+        if self.cache_scope_kwarg is None:
+            return [ALL_LOCATIONS]
+        if self.cache_scope_kwarg not in self.kwargs:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__}.cache_scope_kwarg is '{self.cache_scope_kwarg}', "
+                f"which is not a URL kwarg of this view."
+            )
+        return [self.kwargs[self.cache_scope_kwarg]]
+
+    def get(self, request, *args, **kwargs):
+        versions = ":".join(f"{scope}={get_version(scope)}" for scope in self.get_cache_scopes())
+        digest = hashlib.sha1(f"{request.get_full_path()}|{versions}".encode()).hexdigest()
+        etag = f'"{digest}"'
+
+        if etag_matches(etag, request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+
+        cache_key = f"read-cache:response:{digest}"
+        data = cache.get(cache_key)
+        if data is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(cache_key, data, READ_CACHE_TIMEOUT)
+
+        response = Response(data)
+        response['ETag'] = etag
+        return response
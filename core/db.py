@@ -0,0 +1,21 @@
+from django.conf import settings
+
+# ------------------------------
+# Per-Connection Database Setup
+# ------------------------------
+
+# Milliseconds a SQLite connection waits for the write lock before raising "database is locked".
+SQLITE_BUSY_TIMEOUT_MS = 20000
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    connection_created receiver for the sqlite DB_PROFILE: WAL lets readers run
+    alongside a writer, and synchronous=NORMAL is the durability level WAL is designed for.
+    """
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_WAL', False):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
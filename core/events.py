@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Max
+from django.utils.timezone import now
+
+from core.models import LiveEvent
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------
+# In-Process Event Hub (Server-Sent Events)
+# ------------------------------
+
+# Events buffered per idle client before the oldest are dropped.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Seconds between LiveEvent polls while this process has SSE clients. Events
+# published by this process are delivered at once; other processes' within this delay.
+EVENT_POLL_SECONDS = getattr(settings, 'EVENT_POLL_SECONDS', 1.0)
+EVENT_POLL_OVERLAP = 30  # Seconds of already-relayed rows re-read each poll
+LIVE_EVENT_RETENTION = timedelta(minutes=10)  # Also bounds Last-Event-ID replay
+
+
+class EventHub:
+    """
+    Fans out per-location events to subscribed SSE clients in this process.
+    Publishers may run in any thread (sync views); each subscriber owns an
+    asyncio queue on its event loop, so an idle client costs one queue and no polling.
+    Events reach the hub through `relay`, which also picks up other processes' events.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, location_id):
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers[location_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, location_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(location_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[location_id]
+
+    def has_subscribers(self):
+        with self._lock:
+            return bool(self._subscribers)
+
+    def publish(self, location_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(location_id, ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                pass  # Loop already closed; the stream's finally block unsubscribes it
+
+    @staticmethod
+    def _offer(queue, event):
+        if queue.full():
+            queue.get_nowait()  # Slow client: drop the oldest event rather than block publishers
+        queue.put_nowait(event)
+
+
+hub = EventHub()
+
+
+class EventRelay:
+    """
+    Tails LiveEvent in a daemon thread and hands new rows to `hub`, so SSE clients
+    see changes committed by any server process (gunicorn workers, the task runner).
+    Started by the first subscriber; while the process has no clients it does not query.
+    Each event is delivered at most once per process: rows this process published
+    are delivered on commit and skipped when the poll reads them back.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._checkpoints = deque()  # (polled_at, highest id seen) of recent polls
+        self._delivered = {}         # event id -> delivered_at, kept for EVENT_POLL_OVERLAP
+
+    def ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='event-relay', daemon=True)
+                self._thread.start()
+
+    def deliver(self, event_id, location_id, event):
+        with self._lock:
+            if event_id in self._delivered:
+                return
+            self._delivered[event_id] = time.monotonic()
+        hub.publish(location_id, {**event, "event_id": event_id})
+
+    def _run(self):
+        while True:
+            time.sleep(EVENT_POLL_SECONDS)
+            if not hub.has_subscribers():
+                self._checkpoints.clear()  # Resume from the newest row once clients return
+                continue
+            close_old_connections()  # Honour CONN_MAX_AGE / health checks in this long-lived thread
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Live event poll failed")
+
+    def poll(self):
+        current = time.monotonic()
+        if not self._checkpoints:
+            latest = LiveEvent.objects.aggregate(latest=Max('id'))['latest'] or 0
+            self._checkpoints.append((current, latest))
+            return
+
+        # Ids come from a sequence, so a slow transaction can commit a lower id after
+        # a higher one was read: re-read from a checkpoint at least EVENT_POLL_OVERLAP old.
+        while len(self._checkpoints) > 1 and current - self._checkpoints[1][0] >= EVENT_POLL_OVERLAP:
+            self._checkpoints.popleft()
+        with self._lock:
+            for event_id, delivered_at in list(self._delivered.items()):
+                if current - delivered_at >= EVENT_POLL_OVERLAP * 2:
+                    del self._delivered[event_id]
+
+        rows = (
+            LiveEvent.objects
+            .filter(id__gt=self._checkpoints[0][1])
+            .order_by('id')
+            .values_list('id', 'location_id', 'payload')
+        )
+        last_id = self._checkpoints[-1][1]
+        for event_id, location_id, payload in rows:
+            self.deliver(event_id, location_id, payload)
+            last_id = max(last_id, event_id)
+        self._checkpoints.append((current, last_id))
+
+
+relay = EventRelay()
+
+
+def publish_on_commit(location_id, event):
+    """
+    Record the event in the surrounding transaction and deliver it to this process's
+    clients once it commits, so clients never see rolled-back state.
+    """
+    row = LiveEvent.objects.create(location_id=location_id, payload=event)
+    transaction.on_commit(lambda: relay.deliver(row.id, location_id, event))
+
+
+def events_since(location_id, last_event_id):
+    """
+    Retained events for a location after `last_event_id` (the SSE Last-Event-ID header),
+    so a reconnecting client catches up on what it missed.
+    """
+    rows = (
+        LiveEvent.objects
+        .filter(location_id=location_id, id__gt=last_event_id)
+        .order_by('id')
+        .values_list('id', 'payload')
+    )
+    return [{**payload, "event_id": event_id} for event_id, payload in rows]
+
+
+def prune_live_events():
+    """
+    Delete LiveEvent rows older than LIVE_EVENT_RETENTION.
+    """
+    deleted, _ = LiveEvent.objects.filter(created_at__lt=now() - LIVE_EVENT_RETENTION).delete()
+    return deleted
+
+
+def slot_event(slot):
+    return {
+        "type": "slot",
+        "id": slot.id,
+        "slot_id": str(slot.slot_id),
+        "is_available": slot.is_available,
+        "locked": slot.locked,
+    }
+
+
+def reservation_event(reservation, deleted=False):
+    return {
+        "type": "reservation",
+        "id": reservation.id,
+        "user": reservation.user_id,  # Streams only send reservation events to staff and this user
+        "slot": reservation.slot_id,
+        "status": "Deleted" if deleted else reservation.status,
+        "start_time": reservation.start_time.isoformat(),
+        "end_time": reservation.end_time.isoformat(),
+    }
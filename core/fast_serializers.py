@@ -0,0 +1,176 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+# ------------------------------
+# Fast-Path Read Serializers
+# ------------------------------
+
+# Parent ids per child query when rendering many=True nested serializers.
+CHILD_BATCH_SIZE = 500
+
+
+class FastReadSerializer:
+    """
+    Read-only renderer compiled from a bound ModelSerializer instance.
+    Works on `.values()` rows instead of model instances: each field is compiled once
+    into (values key, converter), so rows skip model construction and DRF's per-field
+    get_attribute dispatch. Output matches the source serializer's JSON.
+
+    Supported: model fields, dotted sources, nested serializers (FK and reverse many=True),
+    PrimaryKeyRelatedField. SerializerMethodField and property-backed fields are not
+    supported and raise ImproperlyConfigured at compile time.
+    """
+
+    def __init__(self, serializer):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        self.model = serializer.Meta.model
+        self.context = serializer.context
+        self.pk_key = self.model._meta.pk.attname
+        self.plan = self._compile(serializer, self.model, prefix='')
+        self.children = self._compile_children(serializer)
+
+    # ---- compile ----
+
+    def _compile(self, serializer, model, prefix):
+        plan = []
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.ListSerializer):
+                plan.append(('many', name, None))  # Filled from a child query, see render()
+                continue
+            if isinstance(field, serializers.Serializer):
+                nested_model = field.Meta.model
+                nested_prefix = prefix + "__".join(field.source_attrs) + "__"
+                plan.append(('nested', name, (
+                    f"{nested_prefix}{nested_model._meta.pk.attname}",
+                    self._compile(field, nested_model, nested_prefix),
+                )))
+                continue
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                raise ImproperlyConfigured(f"FastReadSerializer cannot compile field '{name}'.")
+
+            key = prefix + "__".join(field.source_attrs)
+            plan.append(('value', name, (key, self._converter(field, model, field.source_attrs))))
+        return plan
+
+    def _compile_children(self, serializer):
+        children = []
+        for name, field in serializer.fields.items():
+            if not isinstance(field, serializers.ListSerializer):
+                continue
+            relation = next(
+                (rel for rel in self.model._meta.related_objects if rel.get_accessor_name() == field.source),
+                None,
+            )
+            if relation is None:
+                raise ImproperlyConfigured(f"FastReadSerializer cannot compile many field '{name}'.")
+            child = FastReadSerializer(field.child)
+            children.append((name, relation.related_model, relation.field.attname, child))
+        return children
+
+    def _converter(self, field, model, source_attrs):
+        model_field = self._model_field(model, source_attrs)
+
+        if isinstance(field, serializers.FileField):
+            return self._file_converter(field, model_field)
+        if isinstance(field, serializers.ChoiceField):
+            lookup = field.choice_strings_to_values
+            return lambda value: lookup.get(str(value), value)
+        if isinstance(field, serializers.BooleanField):
+            return bool
+        if isinstance(field, serializers.IntegerField):
+            return int
+        if isinstance(field, serializers.CharField):
+            return str
+        if isinstance(field, (serializers.ReadOnlyField, serializers.PrimaryKeyRelatedField)):
+            return None  # Value is already in its final form
+        return field.to_representation
+
+    @staticmethod
+    def _model_field(model, source_attrs):
+        field = None
+        for attr in source_attrs:
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    f"FastReadSerializer cannot compile source '{'.'.join(source_attrs)}'."
+                )
+            if field.is_relation:
+                model = field.related_model
+        return field
+
+    def _file_converter(self, field, model_field):
+        use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+        storage = model_field.storage
+        request = self.context.get('request')
+
+        def convert(name):
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+        return convert
+
+    # ---- render ----
+
+    @property
+    def keys(self):
+        """
+        The `.values()` keys this serializer reads.
+        """
+        keys = [self.pk_key] if self.children else []
+        self._collect_keys(self.plan, keys)
+        return list(dict.fromkeys(keys))
+
+    def _collect_keys(self, plan, keys):
+        for kind, _, payload in plan:
+            if kind == 'value':
+                keys.append(payload[0])
+            elif kind == 'nested':
+                keys.append(payload[0])
+                self._collect_keys(payload[1], keys)
+
+    def _render_row(self, plan, row):
+        item = {}
+        for kind, name, payload in plan:
+            if kind == 'value':
+                key, convert = payload
+                value = row[key]
+                item[name] = value if value is None or convert is None else convert(value)
+            elif kind == 'many':
+                item[name] = None
+            else:
+                pk_key, nested_plan = payload
+                item[name] = None if row[pk_key] is None else self._render_row(nested_plan, row)
+        return item
+
+    def render(self, rows):
+        """
+        Render `.values(*self.keys)` rows into the serializer's output dicts.
+        """
+        rows = list(rows)
+        data = [self._render_row(self.plan, row) for row in rows]
+
+        for name, child_model, fk_attname, child in self.children:
+            grouped = {row[self.pk_key]: [] for row in rows}
+            parent_ids = list(grouped)
+            for start in range(0, len(parent_ids), CHILD_BATCH_SIZE):
+                child_rows = list(
+                    child_model.objects
+                    .filter(**{f"{fk_attname}__in": parent_ids[start:start + CHILD_BATCH_SIZE]})
+                    .order_by('pk')
+                    .values(fk_attname, *child.keys)
+                )
+                for child_row, child_item in zip(child_rows, child.render(child_rows)):
+                    grouped[child_row[fk_attname]].append(child_item)
+
+            for item, row in zip(data, rows):
+                item[name] = grouped[row[self.pk_key]]
+        return data
+
+    def serialize(self, queryset):
+        return self.render(queryset.values(*self.keys))
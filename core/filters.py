@@ -0,0 +1,46 @@
+from datetime import datetime, time, timedelta
+
+from django.utils.dateparse import parse_date
+from django.utils.timezone import make_aware
+from rest_framework.exceptions import ValidationError
+
+# ------------------------------
+# Reservation List Filters
+# ------------------------------
+
+def _parse_date_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValidationError({name: "Must be a date in YYYY-MM-DD format."})
+    return day
+
+
+def filter_reservations(queryset, params):
+    """
+    Apply the optional list filters shared by reservation endpoints:
+    - status:   exact status (e.g. ?status=Reserved)
+    - location: parking location id
+    - from/to:  inclusive start_time date range (YYYY-MM-DD)
+    """
+    status = params.get('status')
+    if status:
+        queryset = queryset.filter(status=status)
+
+    location = params.get('location')
+    if location:
+        if not location.isdigit():
+            raise ValidationError({'location': "Must be a location id."})
+        queryset = queryset.filter(slot__location_id=int(location))
+
+    date_from = _parse_date_param(params, 'from')
+    if date_from:
+        queryset = queryset.filter(start_time__gte=make_aware(datetime.combine(date_from, time.min)))
+
+    date_to = _parse_date_param(params, 'to')
+    if date_to:
+        queryset = queryset.filter(start_time__lt=make_aware(datetime.combine(date_to + timedelta(days=1), time.min)))
+
+    return queryset
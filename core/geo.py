@@ -0,0 +1,35 @@
+import math
+
+# ------------------------------
+# Geospatial Helpers
+# ------------------------------
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distance in kilometres between two (lat, lng) points in degrees.
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    dlat = lat2 - lat1
+    dlng = lng2 - lng1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(lat, lng, radius_km):
+    """
+    Returns (min_lat, max_lat, min_lng, max_lng) enclosing a circle of radius_km.
+    Used as an index-friendly prefilter before the exact haversine check.
+    Does not wrap across the antimeridian; longitudes are clamped to [-180, 180].
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(lat))
+    dlng = 180.0 if cos_lat < 1e-12 else min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return (
+        max(-90.0, lat - dlat),
+        min(90.0, lat + dlat),
+        max(-180.0, lng - dlng),
+        min(180.0, lng + dlng),
+    )
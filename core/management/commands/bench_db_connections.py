@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from core.management.commands.bench_endpoints import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request database connection cost for the active DB_PROFILE: opening a fresh "
+        "connection (CONN_MAX_AGE=0 behaviour) versus reusing a persistent one, including the "
+        "CONN_HEALTH_CHECKS probe Django runs at the start of each request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help="Simulated requests per mode.")
+
+    def handle(self, *args, **options):
+        iterations = max(1, options['iterations'])
+        database = connection.settings_dict
+        self.stdout.write(
+            f"DB_PROFILE={getattr(settings, 'DB_PROFILE', '?')} vendor={connection.vendor} "
+            f"CONN_MAX_AGE={database['CONN_MAX_AGE']} CONN_HEALTH_CHECKS={database['CONN_HEALTH_CHECKS']} "
+            f"pool={'pool' in database.get('OPTIONS', {})}"
+        )
+
+        def fresh():
+            connection.close()  # With a pool this returns the connection; the next use checks one out
+            self.query()
+
+        def reused():
+            close_old_connections()  # What Django does on request_started/finished
+            self.query()
+
+        self.query()  # Warm up imports and the first connection
+        fresh_ms = self.measure(fresh, iterations)
+        reused_ms = self.measure(reused, iterations)
+
+        self.report("new connection per request", fresh_ms)
+        self.report("persistent connection", reused_ms)
+        saving = percentile(fresh_ms, 0.5) - percentile(reused_ms, 0.5)
+        self.stdout.write(self.style.SUCCESS(f"Connection setup cost per request (p50): {saving:.2f} ms"))
+
+    @staticmethod
+    def query():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+
+    @staticmethod
+    def measure(request, iterations):
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            request()
+            samples.append((time.perf_counter() - started) * 1000)
+        return sorted(samples)
+
+    def report(self, label, samples):
+        self.stdout.write(
+            f"{label}: p50 {percentile(samples, 0.5):.2f} ms, p95 {percentile(samples, 0.95):.2f} ms, "
+            f"max {samples[-1]:.2f} ms"
+        )
@@ -0,0 +1,187 @@
+import json
+import time
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils.timezone import now
+from rest_framework.test import APIClient
+
+from core.management.commands.seed_benchmark import ADMIN_USERNAME, USERNAME_PREFIX
+from core.models import ParkingLocation, Reservation
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-int(fraction * 100) * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the key API endpoints in-process with the test client and record p50/p95/p99 latency, "
+        "queries per request and throughput. Writes a JSON baseline and can compare against a previous one. "
+        "Run `manage.py seed_benchmark` first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help="Timed requests per endpoint.")
+        parser.add_argument('--warmup', type=int, default=5, help="Untimed requests per endpoint first.")
+        parser.add_argument('--only', action='append', help="Only run endpoints whose name contains this (repeatable).")
+        parser.add_argument('--output', help="Write results to this JSON file.")
+        parser.add_argument('--compare', help="Baseline JSON to compare against.")
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help="Allowed p95 slowdown vs the baseline before flagging (0.2 = 20%%).")
+        parser.add_argument('--strict', action='store_true', help="Exit with an error on any regression.")
+
+    def endpoints(self):
+        """
+        (name, method, path, data, as_admin) for each benchmarked call.
+        """
+        location = ParkingLocation.objects.order_by('id').first()
+        if location is None:
+            raise CommandError("No parking locations found; run `manage.py seed_benchmark` first.")
+        start = (now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        window = urlencode({'start': start.isoformat(), 'end': (start + timedelta(hours=2)).isoformat()})
+
+        return [
+            ('locations', 'get', '/api/locations/', None, False),
+            ('locations dashboard', 'get', '/api/locations-dashboard/', None, True),
+            ('slots', 'get', f'/api/slots/{location.id}/', None, False),
+            ('slots available', 'get', f'/api/slots/{location.id}/available/?{window}', None, False),
+            ('slots occupancy', 'get', f'/api/slots/{location.id}/occupancy/', None, True),
+            ('reservations me', 'get', '/api/reservations/me/', None, False),
+            ('reservations all', 'get', '/api/reservations/all/', None, True),
+            ('location reservations', 'get', f'/api/locations/{location.id}/reservations/', None, True),
+            ('summary slot-utilization', 'get', '/api/summary/slot-utilization/', None, True),
+            ('summary overall', 'get', '/api/summary/slot-utilization/overall/', None, True),
+            ('summary daily', 'get', '/api/summary/daily/', None, True),
+            ('summary slot-active', 'get', '/api/summary/slot-active/', None, True),
+            ('summary slot-overdue', 'get', '/api/summary/slot-overdue/', None, True),
+        ]
+
+    def clients(self):
+        admin = User.objects.filter(username=ADMIN_USERNAME).first() or User.objects.filter(is_staff=True).first()
+        # The busiest seeded user, so reservations/me has a full page
+        user_id = (
+            Reservation.objects
+            .filter(user__username__startswith=USERNAME_PREFIX)
+            .values('user_id')
+            .annotate(total=Count('id'))
+            .order_by('-total')
+            .values_list('user_id', flat=True)
+            .first()
+        )
+        user = User.objects.filter(id=user_id).first() if user_id else None
+        if admin is None or user is None:
+            raise CommandError("Need an admin and a user with reservations; run `manage.py seed_benchmark` first.")
+
+        admin_client, user_client = APIClient(), APIClient()
+        admin_client.force_authenticate(user=admin)
+        user_client.force_authenticate(user=user)
+        return admin_client, user_client
+
+    def handle(self, *args, **options):
+        endpoints = self.endpoints()
+        if options['only']:
+            endpoints = [e for e in endpoints if any(term in e[0] for term in options['only'])]
+
+        with override_settings(ALLOWED_HOSTS=['*'], DEBUG=False):
+            admin_client, user_client = self.clients()
+            results = {}
+            for name, method, path, data, as_admin in endpoints:
+                client = admin_client if as_admin else user_client
+                results[name] = self.measure(client, method, path, data, options['warmup'], options['requests'])
+                stats = results[name]
+                self.stdout.write(
+                    f"{name}: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+                    f"p99 {stats['p99_ms']:.1f} ms, {stats['queries']:.1f} queries, "
+                    f"{stats['throughput_rps']:.0f} req/s, {stats['bytes']} bytes"
+                )
+
+        report = {
+            'recorded_at': now().isoformat(),
+            'database': connection.vendor,
+            'cache': settings.CACHES['default']['BACKEND'],
+            'rows': {
+                'locations': ParkingLocation.objects.count(),
+                'reservations': Reservation.objects.count(),
+            },
+            'requests_per_endpoint': options['requests'],
+            'endpoints': results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options['compare']:
+            regressions = self.compare(options['compare'], results, options['tolerance'])
+            if regressions and options['strict']:
+                raise CommandError(f"{regressions} endpoint(s) regressed against {options['compare']}.")
+
+    def measure(self, client, method, path, data, warmup, count):
+        call = getattr(client, method)
+        for _ in range(warmup):
+            call(path, data)
+
+        latencies = []
+        queries = 0
+        size = 0
+        started = time.perf_counter()
+        for _ in range(max(1, count)):
+            with CaptureQueriesContext(connection) as captured:
+                request_started = time.perf_counter()
+                response = call(path, data)
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            if response.status_code >= 400:
+                raise CommandError(f"{method.upper()} {path} returned {response.status_code}.")
+            queries += len(captured)
+            size = len(response.content) if not response.streaming else 0
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'path': path,
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'queries': round(queries / len(latencies), 2),
+            'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            'bytes': size,
+        }
+
+    def compare(self, path, results, tolerance):
+        try:
+            with open(path) as handle:
+                baseline = json.load(handle)['endpoints']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Could not read baseline {path}: {exc}")
+
+        regressions = 0
+        for name, stats in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            problems = []
+            if stats['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+                problems.append(f"p95 {before['p95_ms']:.1f} -> {stats['p95_ms']:.1f} ms")
+            if stats['queries'] > before['queries']:
+                problems.append(f"queries {before['queries']} -> {stats['queries']}")
+
+            if problems:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f"REGRESSION {name}: {', '.join(problems)}"))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {path}."))
+        return regressions
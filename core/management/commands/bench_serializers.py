@@ -0,0 +1,82 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core.fast_serializers import FastReadSerializer
+from core.models import ParkingLocation, Reservation
+from core.serializers import ParkingLocationWithSlotsSerializer, ReservationAdminSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF ModelSerializer output with the FastReadSerializer path on existing rows. "
+        "Checks the rendered JSON is identical and reports timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, action='append',
+                            help="Reservation row counts to benchmark (repeatable). Default: 10000 and 100000.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement; the best is reported.")
+
+    def handle(self, *args, **options):
+        row_counts = options['rows'] or [10000, 100000]
+        repeat = options['repeat']
+        renderer = JSONRenderer()
+        available = Reservation.objects.count()
+
+        for rows in row_counts:
+            if rows > available:
+                self.stdout.write(self.style.WARNING(
+                    f"Only {available} reservations exist; benchmarking {available} instead of {rows}."
+                ))
+                rows = available
+            if rows:
+                last_id = Reservation.objects.order_by('id').values_list('id', flat=True)[rows - 1]
+                queryset = Reservation.objects.filter(id__lte=last_id).order_by('id')
+            else:
+                queryset = Reservation.objects.none()
+
+            def drf():
+                reservations = queryset.select_related("user", "slot", "slot__location")
+                return ReservationAdminSerializer(reservations, many=True).data
+
+            def fast():
+                return FastReadSerializer(ReservationAdminSerializer()).serialize(queryset)
+
+            self.compare(f"reservations x{rows}", drf, fast, renderer, repeat)
+
+        def drf_locations():
+            locations = ParkingLocation.objects.prefetch_related("parkingslot_set").order_by('id')
+            return ParkingLocationWithSlotsSerializer(locations, many=True).data
+
+        def fast_locations():
+            return FastReadSerializer(ParkingLocationWithSlotsSerializer()).serialize(
+                ParkingLocation.objects.order_by('id')
+            )
+
+        self.compare("locations dashboard", drf_locations, fast_locations, renderer, repeat)
+
+    def compare(self, label, drf, fast, renderer, repeat):
+        drf_seconds, drf_json = self.best_of(drf, renderer, repeat)
+        fast_seconds, fast_json = self.best_of(fast, renderer, repeat)
+
+        if drf_json != fast_json:
+            raise CommandError(f"{label}: fast path output differs from the DRF serializer.")
+
+        speedup = (drf_seconds / fast_seconds) if fast_seconds else float('inf')
+        self.stdout.write(
+            f"{label}: drf {drf_seconds * 1000:.1f} ms, fast {fast_seconds * 1000:.1f} ms, "
+            f"{speedup:.1f}x, {len(fast_json)} bytes (identical)"
+        )
+
+    @staticmethod
+    def best_of(build, renderer, repeat):
+        best = None
+        output = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            output = renderer.render(build())
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
@@ -0,0 +1,67 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+
+from core.models import Reservation
+
+# Full-table scans of core_reservation in EXPLAIN output (Postgres / SQLite).
+# SQLite's "SCAN ... USING INDEX" walks an index in order and is not flagged.
+SEQ_SCAN_PATTERN = re.compile(r"Seq Scan on core_reservation\b|\bSCAN core_reservation\b(?! USING)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Print EXPLAIN plans for the hot Reservation queries and flag any that scan the whole table. "
+        "Run it against a seeded database: on a near-empty table Postgres may prefer a seq scan anyway."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strict', action='store_true',
+                            help="Exit with an error if any hot query plans a full scan of core_reservation.")
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan, not only flagged ones.")
+
+    def hot_queries(self):
+        current_time = now()
+        sample = Reservation.objects.order_by('id').values('user_id', 'slot_id').first() or {
+            'user_id': 0, 'slot_id': 0,
+        }
+        return {
+            "status count (analytics summaries)": Reservation.objects.filter(status="Active"),
+            "currently parked per slot (occupancy)": Reservation.objects.filter(
+                slot_id=sample['slot_id'],
+                last_park_in__lte=current_time,
+                last_park_out__isnull=True,
+            ).order_by('-last_park_in'),
+            "my reservations page": Reservation.objects.filter(
+                user_id=sample['user_id'],
+            ).order_by('-created_at', '-id')[:51],
+            "all reservations page": Reservation.objects.order_by('-created_at', '-id')[:51],
+            "start_time day range (filters, rollup rebuild)": Reservation.objects.filter(
+                start_time__gte=current_time - timedelta(days=1),
+                start_time__lt=current_time,
+            ),
+            "open past end_time (overdue cron)": Reservation.objects.filter(
+                end_time__lt=current_time,
+                last_park_out__isnull=True,
+            ).exclude(status="Overdue"),
+        }
+
+    def handle(self, *args, **options):
+        flagged = []
+        for label, queryset in self.hot_queries().items():
+            plan = queryset.explain()
+            full_scan = bool(SEQ_SCAN_PATTERN.search(plan))
+            if full_scan:
+                flagged.append(label)
+
+            if full_scan:
+                self.stdout.write(self.style.WARNING(f"{label}: full table scan"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{label}: index"))
+            if full_scan or options['verbose_plans']:
+                self.stdout.write(plan)
+
+        if flagged and options['strict']:
+            raise CommandError(f"{len(flagged)} hot quer{'y' if len(flagged) == 1 else 'ies'} plan a full scan.")
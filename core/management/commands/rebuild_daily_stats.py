@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.rollups import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild the DailyLocationStats rollup from the reservation table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help="Only rebuild buckets on or after this date (YYYY-MM-DD). Defaults to a full rebuild.",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_date(options['since'])
+            if since is None:
+                raise CommandError("--since must be a date in YYYY-MM-DD format.")
+
+        written = rebuild_daily_stats(since=since)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} daily location stats rows."))
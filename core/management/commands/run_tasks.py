@@ -0,0 +1,56 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.tasks import HEARTBEAT_SECONDS, claim_tasks, heartbeat, prune_done_tasks, requeue_stale_tasks, run_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background tasks from the database queue with a thread pool. "
+        "Start several of these processes for more parallelism; claims never overlap."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help="Tasks run concurrently by this worker.")
+        parser.add_argument('--poll', type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Drain the due tasks once, then exit.")
+        parser.add_argument('--keep-done-hours', type=int, default=24, help="Prune finished tasks older than this.")
+
+    def handle(self, *args, **options):
+        threads = max(1, options['threads'])
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        keep_done = timedelta(hours=options['keep_done_hours'])
+        next_maintenance = 0.0
+        next_heartbeat = time.monotonic() + HEARTBEAT_SECONDS
+
+        self.stdout.write(f"Task worker {worker_id} started with {threads} thread(s).")
+        running = set()
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='task') as pool:
+            while True:
+                if time.monotonic() >= next_maintenance:
+                    requeue_stale_tasks()
+                    prune_done_tasks(keep_done)
+                    next_maintenance = time.monotonic() + 60
+                if running and time.monotonic() >= next_heartbeat:
+                    heartbeat(worker_id)
+                    next_heartbeat = time.monotonic() + HEARTBEAT_SECONDS
+
+                capacity = threads - len(running)
+                claimed = claim_tasks(worker_id, capacity) if capacity else []
+                close_old_connections()
+                for task in claimed:
+                    running.add(pool.submit(run_task, task))
+
+                if running:
+                    done, running = wait(running, timeout=min(options['poll'], HEARTBEAT_SECONDS), return_when=FIRST_COMPLETED)
+                    running = set(running)
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll'])
@@ -0,0 +1,180 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+
+from core.models import ParkingLocation, ParkingSlot, Reservation
+from core.rollups import rebuild_daily_stats
+
+# Benchmark rows are recognisable by these prefixes, so --clear never touches real data.
+USERNAME_PREFIX = 'bench_user_'
+ADMIN_USERNAME = 'bench_admin'
+LOCATION_PREFIX = 'Bench Location '
+PLATE_PREFIX = 'BENCH-'
+BENCH_PASSWORD = 'bench-password'
+
+BATCH_SIZE = 2000
+VEHICLES = [
+    ('Toyota', 'Vios', 'Sedan'), ('Honda', 'Civic', 'Sedan'), ('Mitsubishi', 'Montero', 'SUV'),
+    ('Ford', 'Ranger', 'Pickup'), ('Suzuki', 'Ertiga', 'MPV'), ('Nissan', 'Navara', 'Pickup'),
+    ('Yamaha', 'NMAX', 'Motorcycle'), ('Hyundai', 'Accent', 'Sedan'),
+]
+FLOORS = ['B1', 'B2', 'L1', 'L2', 'L3', 'Z1', 'Z2']
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate locations, slots, users and reservations for benchmarking with bulk_create. "
+        "Reservations never overlap on a slot and get statuses consistent with their times. "
+        "Rebuilds the analytics rollup afterwards. Pair with `manage.py bench_endpoints`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations', type=int, default=20)
+        parser.add_argument('--slots-per-location', type=int, default=50)
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--reservations', type=int, default=100000)
+        parser.add_argument('--days', type=int, default=90, help="History window the reservations span.")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed, for repeatable datasets.")
+        parser.add_argument('--clear', action='store_true', help="Delete previously seeded benchmark rows first.")
+
+    def handle(self, *args, **options):
+        if min(options['locations'], options['slots_per_location'], options['users']) < 1:
+            raise CommandError("--locations, --slots-per-location and --users must be at least 1.")
+        if options['days'] < 1:
+            raise CommandError("--days must be at least 1.")
+
+        rng = random.Random(options['seed'])
+
+        if options['clear']:
+            self.clear()
+        elif ParkingLocation.objects.filter(name__startswith=LOCATION_PREFIX).exists():
+            raise CommandError("Benchmark data already exists; pass --clear to replace it.")
+
+        with transaction.atomic():
+            locations = self.create_locations(rng, options['locations'], options['slots_per_location'])
+            slot_ids = self.create_slots(rng, locations, options['slots_per_location'])
+            user_ids = self.create_users(options['users'])
+            created = self.create_reservations(rng, slot_ids, user_ids, options['reservations'], options['days'])
+
+        rollup_rows = rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(locations)} locations, {len(slot_ids)} slots, {len(user_ids)} users "
+            f"and {created} reservations ({rollup_rows} rollup rows). "
+            f"Admin login: {ADMIN_USERNAME} / {BENCH_PASSWORD}"
+        ))
+
+    def clear(self):
+        # Reservations cascade from users and slots
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        User.objects.filter(username=ADMIN_USERNAME).delete()
+        ParkingLocation.objects.filter(name__startswith=LOCATION_PREFIX).delete()
+        Reservation.objects.filter(plate_number__startswith=PLATE_PREFIX).delete()
+
+    def create_locations(self, rng, count, slots_per_location):
+        locations = [
+            ParkingLocation(
+                name=f"{LOCATION_PREFIX}{index + 1}",
+                address=f"{rng.randint(1, 999)} Benchmark Street, Metro Manila",
+                slots=slots_per_location,
+                latitude=round(14.40 + rng.random() * 0.35, 6),
+                longitude=round(120.95 + rng.random() * 0.20, 6),
+            )
+            for index in range(count)
+        ]
+        ParkingLocation.objects.bulk_create(locations, batch_size=BATCH_SIZE)
+        return list(ParkingLocation.objects.filter(name__startswith=LOCATION_PREFIX).order_by('id'))
+
+    def create_slots(self, rng, locations, per_location):
+        slots = [
+            ParkingSlot(location=location, floorzone_number=rng.choice(FLOORS))
+            for location in locations
+            for _ in range(per_location)
+        ]
+        ParkingSlot.objects.bulk_create(slots, batch_size=BATCH_SIZE)
+        return list(
+            ParkingSlot.objects.filter(location__in=locations).order_by('id').values_list('id', flat=True)
+        )
+
+    def create_users(self, count):
+        password = make_password(BENCH_PASSWORD)  # Hash once; hashing per user would dominate seeding
+        users = [
+            User(username=f"{USERNAME_PREFIX}{index + 1}", email=f"{USERNAME_PREFIX}{index + 1}@example.com",
+                 password=password)
+            for index in range(count)
+        ]
+        users.append(User(username=ADMIN_USERNAME, email='bench_admin@example.com', password=password,
+                          is_staff=True, is_superuser=True))
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        return list(
+            User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('id').values_list('id', flat=True)
+        )
+
+    def create_reservations(self, rng, slot_ids, user_ids, count, days):
+        """
+        Walk each slot's timeline forward from `days` ago, so bookings on a slot never overlap.
+        The newest ~10% land in the future, the way a real booking table looks.
+        """
+        current_time = now()
+        window = timedelta(days=days)
+        per_slot = max(1, -(-count // len(slot_ids)))
+        step = (window + window / 10) / per_slot  # Average spacing between bookings on one slot
+        cursors = {slot_id: current_time - window + step * rng.random() for slot_id in slot_ids}
+
+        batch = []
+        created = 0
+        for index in range(count):
+            slot_id = slot_ids[index % len(slot_ids)]
+            start = cursors[slot_id]
+            duration = step * rng.uniform(0.2, 0.7)
+            end = start + duration
+            cursors[slot_id] = end + step * rng.uniform(0.3, 0.8)
+
+            make, model, vehicle_type = rng.choice(VEHICLES)
+            batch.append(Reservation(
+                user_id=rng.choice(user_ids),
+                slot_id=slot_id,
+                start_time=start,
+                end_time=end,
+                vehicle_make=make,
+                vehicle_model=model,
+                vehicle_type=vehicle_type,
+                plate_number=f"{PLATE_PREFIX}{index:08d}",
+                **self.lifecycle(rng, start, end, current_time),
+            ))
+            if len(batch) >= BATCH_SIZE:
+                Reservation.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+
+        if batch:
+            Reservation.objects.bulk_create(batch)
+            created += len(batch)
+        return created
+
+    @staticmethod
+    def lifecycle(rng, start, end, current_time):
+        """
+        Status and park-in/out times consistent with where the booking sits relative to now.
+        """
+        if start > current_time:
+            return {'status': rng.choice(['Pending', 'Processing', 'Reserved', 'Reserved'])}
+
+        if end > current_time:
+            if rng.random() < 0.7:
+                return {'status': 'Active', 'last_park_in': start + (end - start) * rng.uniform(0, 0.1)}
+            return {'status': 'Reserved'}
+
+        roll = rng.random()
+        if roll < 0.08:
+            return {'status': 'Cancelled'}
+        park_in = start + (end - start) * rng.uniform(0, 0.1)
+        if roll < 0.11:
+            return {'status': 'Overdue', 'last_park_in': park_in}
+        park_out = end - (end - start) * rng.uniform(0, 0.2)
+        status = 'Complete' if roll < 0.8 else 'Checked-out'
+        return {'status': status, 'last_park_in': park_in, 'last_park_out': park_out}
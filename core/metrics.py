@@ -0,0 +1,204 @@
+import contextvars
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+slow_logger = logging.getLogger('core.slow_requests')
+
+# ------------------------------
+# Request Metrics (in-process)
+# ------------------------------
+
+SLOW_REQUEST_MS = getattr(settings, 'SLOW_REQUEST_MS', 500)   # Log requests slower than this
+SLOW_REQUEST_TOP_SQL = getattr(settings, 'SLOW_REQUEST_TOP_SQL', 5)
+SQL_LOG_CHARS = 500                                            # Truncate logged statements
+
+# Histogram bucket upper bounds in ms; the last bucket catches everything slower.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram: constant memory per view, percentiles estimated as bucket upper bounds.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def percentile(self, fraction):
+        count = self.count
+        if not count:
+            return 0.0
+        target = fraction * count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        count = self.count
+        return {
+            'count': count,
+            'mean': round(self.total / count, 3) if count else 0.0,
+            'p50': round(self.percentile(0.50), 3),
+            'p95': round(self.percentile(0.95), 3),
+            'p99': round(self.percentile(0.99), 3),
+            'max': round(self.max, 3),
+            'buckets': {
+                ('+Inf' if bound == float('inf') else str(bound)): bucket_count
+                for bound, bucket_count in zip(self.buckets, self.counts)
+            },
+        }
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.wall_ms = Histogram()
+        self.db_ms = Histogram()
+        self.queries = Histogram(buckets=(1, 2, 5, 10, 20, 50, 100, float('inf')))
+        self.response_bytes = 0
+        self.statuses = {}
+
+    def snapshot(self):
+        return {
+            'wall_ms': self.wall_ms.snapshot(),
+            'db_ms': self.db_ms.snapshot(),
+            'queries': self.queries.snapshot(),
+            'response_bytes': self.response_bytes,
+            'statuses': dict(self.statuses),
+        }
+
+
+class MetricsRegistry:
+    """
+    Per-view aggregates for this process. Each server process keeps its own.
+    """
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, view_name, status_code, wall_ms, recorder, response_bytes):
+        with self._lock:
+            metrics = self._views.get(view_name)
+            if metrics is None:
+                metrics = self._views[view_name] = ViewMetrics()
+            metrics.wall_ms.observe(wall_ms)
+            metrics.db_ms.observe(recorder.db_ms)
+            metrics.queries.observe(recorder.count)
+            metrics.response_bytes += response_bytes
+            metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            views = {name: metrics.snapshot() for name, metrics in sorted(self._views.items())}
+        return {
+            'pid': os.getpid(),
+            'since': self.started_at,
+            'views': views,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+            self.started_at = time.time()
+
+
+registry = MetricsRegistry()
+
+
+# ------------------------------
+# Query Recording
+# ------------------------------
+
+class QueryRecorder:
+    """
+    Query count, DB time and the slowest statements for one request.
+    """
+
+    def __init__(self, keep=SLOW_REQUEST_TOP_SQL):
+        self.count = 0
+        self.db_ms = 0.0
+        self.keep = keep
+        self._slowest = []  # min-heap of (ms, sequence, sql)
+
+    def add(self, sql, elapsed_ms):
+        self.count += 1
+        self.db_ms += elapsed_ms
+        entry = (elapsed_ms, self.count, sql)
+        if len(self._slowest) < self.keep:
+            heapq.heappush(self._slowest, entry)
+        elif elapsed_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def top_sql(self):
+        return [
+            {'ms': round(ms, 3), 'sql': sql[:SQL_LOG_CHARS]}
+            for ms, _, sql in sorted(self._slowest, reverse=True)
+        ]
+
+
+# The recorder for the request being handled. A context variable rather than a
+# thread-local: under ASGI, asgiref copies it into the thread that runs sync views.
+current_recorder = contextvars.ContextVar('current_recorder', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    connection.execute_wrapper hook; a no-op outside an instrumented request.
+    """
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.add(sql, (time.perf_counter() - started) * 1000)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    connection_created receiver: attach record_query to every DB connection once,
+    so queries run from any thread are seen without wrapping each request.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def log_slow_request(request, view_name, status_code, wall_ms, recorder, response_bytes):
+    slow_logger.warning(json.dumps({
+        'event': 'slow_request',
+        'view': view_name,
+        'method': request.method,
+        'path': request.path,
+        'status': status_code,
+        'wall_ms': round(wall_ms, 3),
+        'db_ms': round(recorder.db_ms, 3),
+        'queries': recorder.count,
+        'bytes': response_bytes,
+        'top_sql': recorder.top_sql(),
+    }))
@@ -0,0 +1,121 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from core.metrics import SLOW_REQUEST_MS, QueryRecorder, current_recorder, log_slow_request, registry
+from core.profiling import PROFILE_HEADER, is_staff_request, requested_mode, run_profiled
+
+# ------------------------------
+# Request Instrumentation
+# ------------------------------
+
+
+class RequestMetricsMiddleware:
+    """
+    Records per-view wall time, query count, DB time and response bytes into
+    core.metrics.registry, and logs requests slower than SLOW_REQUEST_MS with their top SQL.
+    Works under WSGI and ASGI; query timing comes from core.metrics.record_query.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        self.finish(request, response, started, recorder)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        self.finish(request, response, started, recorder)
+        return response
+
+    @staticmethod
+    def finish(request, response, started, recorder):
+        wall_ms = (time.perf_counter() - started) * 1000
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.view_name or match._func_path) if match else 'unresolved'
+        # Streaming bodies (exports, SSE) are not buffered, so their size is unknown here
+        response_bytes = 0 if response.streaming else len(response.content)
+
+        registry.record(view_name, response.status_code, wall_ms, recorder, response_bytes)
+        if wall_ms >= SLOW_REQUEST_MS:
+            log_slow_request(request, view_name, response.status_code, wall_ms, recorder, response_bytes)
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in profiling of the view call (see core/profiling.py):
+    - staff requests with `X-Profile: cprofile` (or `1`) / `X-Profile: sample`;
+      the stored profile id is returned in the X-Profile-Id response header;
+    - a random PROFILE_SAMPLE_RATE fraction of all requests (cProfile).
+    Profiles run in process_view, on the thread that executes the sync view, so they
+    also work under ASGI; the response is rendered inside the profile, so serialization
+    and rendering are measured too. Async views (the SSE stream) are never profiled.
+    Keep it last in MIDDLEWARE, since it calls the view itself.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view  # Django picks up the hook in the matching mode
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        mode = requested_mode(request)
+        if mode is None or iscoroutinefunction(view_func):
+            return None
+        return self.profile_view(mode, request, view_func, view_args, view_kwargs)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        mode = requested_mode(request)
+        if mode is None or iscoroutinefunction(view_func):
+            return None
+        return await sync_to_async(self.profile_view, thread_sensitive=True)(
+            mode, request, view_func, view_args, view_kwargs
+        )
+
+    @staticmethod
+    def profile_view(mode, request, view_func, view_args, view_kwargs):
+        on_demand = PROFILE_HEADER in request.headers
+        if on_demand and not is_staff_request(request):
+            return None  # Not allowed: let Django call the view normally
+
+        def call():
+            response = view_func(request, *view_args, **view_kwargs)
+            # DRF / template responses render lazily after the middleware chain;
+            # render() is idempotent, so Django keeps the already rendered content.
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+            return response
+
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        response, profile_id = run_profiled(mode, view_name, call)
+        if on_demand and profile_id:
+            response['X-Profile-Id'] = profile_id
+        return response
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.2 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_reservation_created_at_alter_parkingslot_slot_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['slot', 'start_time', 'end_time'], name='reservation_slot_window_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_reservation_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyLocationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('reservations', models.IntegerField(default=0)),
+                ('active_reservations', models.IntegerField(default=0)),
+                ('check_ins', models.IntegerField(default=0)),
+                ('check_outs', models.IntegerField(default=0)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.parkinglocation')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('location', 'date'), name='dailylocationstats_location_date')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.2 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_dailylocationstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('last_park_out__isnull', True)), fields=['end_time'], name='reservation_open_end_time_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.2 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_reservation_open_end_time_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parkinglocation',
+            index=models.Index(fields=['latitude', 'longitude'], name='location_lat_lng_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_parkinglocation_lat_lng_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='receipt_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='receipts/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='receipt_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.2 on 2026-10-18 18:30
+
+from django.db import migrations
+from django.db.models import Count, Exists, OuterRef, Q
+
+# Statuses that held a slot under the old booking flow, which set
+# is_available=False on booking and only reset it on cancel / check-out.
+BLOCKING_STATUSES = ['Pending', 'Processing', 'Reserved', 'Active', 'Overdue']
+
+
+def reopen_booked_slots(apps, schema_editor):
+    """
+    is_available now means "open for reservation" (see core/availability.py);
+    bookings are found from reservation windows. Reopen slots that were only
+    closed because they were booked, so they can take other time windows.
+    Admin-locked slots and slots retired by bulk provisioning (which have no
+    blocking reservation) stay closed.
+    """
+    ParkingSlot = apps.get_model('core', 'ParkingSlot')
+    ParkingLocation = apps.get_model('core', 'ParkingLocation')
+    Reservation = apps.get_model('core', 'Reservation')
+
+    booked = Reservation.objects.filter(slot=OuterRef('pk'), status__in=BLOCKING_STATUSES)
+    (
+        ParkingSlot.objects
+        .filter(Exists(booked), is_available=False, locked=False)
+        .update(is_available=True)
+    )
+
+    # Same reconciliation as ParkingLocation.sync_slot_count
+    locations = ParkingLocation.objects.annotate(
+        open_slots=Count('parkingslot', filter=Q(parkingslot__is_available=True))
+    )
+    stale = [location for location in locations if location.slots != location.open_slots]
+    for location in stale:
+        location.slots = location.open_slots
+    ParkingLocation.objects.bulk_update(stale, ['slots'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_reservation_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(reopen_booked_slots, migrations.RunPython.noop),
+    ]
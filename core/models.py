@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
+import os
 import uuid
 
 # ------------------------------
@@ -12,11 +14,17 @@ class ParkingLocation(models.Model):
     """
     name = models.CharField(max_length=100)
     address = models.TextField()
-    slots = models.PositiveSmallIntegerField()  # Total slot count (editable by admin)
+    slots = models.PositiveSmallIntegerField()  # Open slot count (kept in sync by sync_slot_count)
     google_maps_url = models.URLField(blank=True, null=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Bounding-box prefilter for the nearby search (see core/geo.py)
+            models.Index(fields=['latitude', 'longitude'], name='location_lat_lng_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -27,6 +35,13 @@ class ParkingLocation(models.Model):
         """
         return list(self.parkingslot_set.values_list('slot_id', flat=True))
 
+    def sync_slot_count(self):
+        """
+        Reconcile `slots` with the number of slot rows open for reservation.
+        """
+        self.slots = self.parkingslot_set.filter(is_available=True).count()
+        self.save(update_fields=['slots'])
+
 
 # ------------------------------
 # Parking Slot Model
@@ -53,7 +68,14 @@ class ParkingSlot(models.Model):
 class Reservation(models.Model):
     """
     Stores user reservation details for a specific parking slot.
+    save() and delete() keep the DailyLocationStats rollup in sync (core/signals.py).
+    QuerySet.update() and bulk_update() skip those signals: callers changing the
+    ROLLUP_FIELDS must adjust the rollup themselves (as OverdueReservationCronJob
+    does) or run `manage.py rebuild_daily_stats`.
     """
+    # Fields that decide a reservation's rollup bucket and counts (core/rollups.py)
+    ROLLUP_FIELDS = ('slot_id', 'start_time', 'status', 'last_park_in', 'last_park_out')
+
     STATUS_CHOICES = [
         ('Pending', 'Pending'),           # Reservation created but no receipt uploaded yet
         ('Processing', 'Processing'),     # Receipt uploaded, awaiting admin approval
@@ -76,6 +98,8 @@ class Reservation(models.Model):
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
     receipt = models.ImageField(upload_to='receipts/', blank=True, null=True)
+    receipt_thumbnail = models.ImageField(upload_to='receipts/thumbs/', blank=True, null=True)
+    receipt_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True)  # SHA-256 of the upload
 
     # Required vehicle information
     vehicle_make = models.CharField(max_length=50)
@@ -85,5 +109,174 @@ class Reservation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Client-supplied Idempotency-Key header, so retried bookings return the original row
+    idempotency_key = models.CharField(max_length=64, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Interval lookups for the availability engine (see core/availability.py)
+            models.Index(fields=['slot', 'start_time', 'end_time'], name='reservation_slot_window_idx'),
+            # Open reservations by end time, scanned by the overdue cron job
+            models.Index(
+                fields=['end_time'],
+                condition=models.Q(last_park_out__isnull=True),
+                name='reservation_open_end_time_idx',
+            ),
+            # Status counts and ?status= filters
+            models.Index(fields=['status'], name='reservation_status_idx'),
+            # Currently parked reservation per slot (occupancy view)
+            models.Index(
+                fields=['slot', 'last_park_in'],
+                condition=models.Q(last_park_out__isnull=True),
+                name='reservation_slot_parked_idx',
+            ),
+            # Cursor pagination: per user (reservations/me) and global (reservations/all)
+            models.Index(fields=['user', '-created_at', '-id'], name='reservation_user_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='reservation_created_idx'),
+            # Day-bucketed analytics and ?from=/?to= ranges
+            models.Index(fields=['start_time'], name='reservation_start_time_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'idempotency_key'], name='reservation_user_idempotency_key'),
+        ]
+
     def __str__(self):
         return f"Reservation #{self.id} ({self.status})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the loaded rollup fields, so saving needs no extra SELECT
+        instance = super().from_db(db, field_names, values)
+        instance._rollup_loaded = instance.rollup_state()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        loaded = getattr(self, '_rollup_loaded', None)
+        if fields is None or loaded is None:
+            self._rollup_loaded = self.rollup_state()
+        else:
+            refreshed = {self._meta.get_field(name).attname for name in fields}
+            loaded.update({name: getattr(self, name) for name in self.ROLLUP_FIELDS if name in refreshed})
+
+    def rollup_state(self):
+        """
+        Current values of ROLLUP_FIELDS, or None if any of them is deferred.
+        """
+        if self.get_deferred_fields().intersection(self.ROLLUP_FIELDS):
+            return None
+        return {name: getattr(self, name) for name in self.ROLLUP_FIELDS}
+
+
+# ------------------------------
+# Daily Location Stats (Analytics Rollup)
+# ------------------------------
+
+class DailyLocationStats(models.Model):
+    """
+    Precomputed per-location, per-day reservation counts for the analytics endpoints.
+    Rows are bucketed by reservation start date and kept in sync incrementally
+    (see core/rollups.py); rebuild with `manage.py rebuild_daily_stats`.
+    """
+    location = models.ForeignKey(ParkingLocation, on_delete=models.CASCADE)
+    date = models.DateField()
+    reservations = models.IntegerField(default=0)         # Reservations starting that day
+    active_reservations = models.IntegerField(default=0)  # Of those, currently 'Reserved' or 'Active'
+    check_ins = models.IntegerField(default=0)            # Of those, with a park-in recorded
+    check_outs = models.IntegerField(default=0)           # Of those, with a park-out recorded
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['location', 'date'], name='dailylocationstats_location_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.location_id} @ {self.date}: {self.reservations} reservations"
+
+
+# ------------------------------
+# Receipt Upload (Chunked / Resumable)
+# ------------------------------
+
+class ReceiptUpload(models.Model):
+    """
+    An in-progress chunked receipt upload.
+    Bytes are appended to a .part file under MEDIA_ROOT/uploads/; its size is the resume offset.
+    """
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    reservation = models.ForeignKey(Reservation, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveIntegerField()  # Total bytes declared at init
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Upload {self.upload_id} for reservation #{self.reservation_id}"
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.MEDIA_ROOT, 'uploads', f"{self.upload_id}.part")
+
+    @property
+    def offset(self):
+        """
+        Bytes received so far.
+        """
+        try:
+            return os.path.getsize(self.part_path)
+        except FileNotFoundError:
+            return 0
+
+
+# ------------------------------
+# Background Task (DB-backed queue)
+# ------------------------------
+
+class Task(models.Model):
+    """
+    A queued side effect run by `manage.py run_tasks` (see core/tasks.py).
+    `name` is the dotted path of the function to call with `args`.
+    """
+    STATUS_CHOICES = [
+        ('Queued', 'Queued'),     # Waiting for a worker (or for run_after on retry)
+        ('Running', 'Running'),   # Claimed by a worker
+        ('Done', 'Done'),         # Finished successfully
+        ('Dead', 'Dead'),         # Failed max_attempts times (dead letter)
+    ]
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='task_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task #{self.id} {self.name} ({self.status})"
+
+
+# ------------------------------
+# Live Event Log (SSE fan-out)
+# ------------------------------
+
+class LiveEvent(models.Model):
+    """
+    A slot/reservation change for one location, written in the transaction that
+    made it. Every server process tails this table and relays new rows to its own
+    SSE clients (see core/events.py). Rows are pruned after LIVE_EVENT_RETENTION.
+    """
+    location_id = models.IntegerField()
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"LiveEvent #{self.id} location={self.location_id} {self.payload.get('type')}"
@@ -0,0 +1,22 @@
+from rest_framework.pagination import CursorPagination
+
+# ------------------------------
+# Cursor Pagination
+# ------------------------------
+
+class ReservationCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+    Each page is an indexed range scan, so cost stays flat however deep the client pages.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-created_at', '-id')
+
+
+class UserCursorPagination(ReservationCursorPagination):
+    """
+    Keyset pagination for users over (date_joined, id), newest first.
+    """
+    ordering = ('-date_joined', '-id')
@@ -0,0 +1,214 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+# ------------------------------
+# Opt-In Request Profiling
+# ------------------------------
+
+PROFILE_DIR = getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles'))
+PROFILE_SAMPLE_RATE = getattr(settings, 'PROFILE_SAMPLE_RATE', 0.0)   # Fraction of requests profiled at random
+PROFILE_MAX_PER_VIEW = getattr(settings, 'PROFILE_MAX_PER_VIEW', 10)  # Oldest are deleted beyond these caps
+PROFILE_MAX_STORED = getattr(settings, 'PROFILE_MAX_STORED', 100)
+
+PROFILE_HEADER = 'X-Profile'            # Admin requests: "cprofile" (or "1") / "sample"
+STACK_SAMPLE_INTERVAL = 0.005           # Seconds between stack samples
+PSTATS_LINES = 60                       # Functions listed in the text summary
+
+MODES = {'1': 'cprofile', 'cprofile': 'cprofile', 'sample': 'sample'}
+EXTENSIONS = {'cprofile': ('.prof', '.txt'), 'sample': ('.folded',)}
+PROFILE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.-]+__\d+_\d+\.(prof|txt|folded)$')
+
+# One profiled request at a time per process, so profiling never stacks up overhead.
+_profile_slot = threading.Lock()
+
+
+def requested_mode(request):
+    """
+    Profiling mode asked for by the header or picked by sampling, or None.
+    Cheap (no I/O); a header request must still pass is_staff_request().
+    """
+    header = request.headers.get(PROFILE_HEADER)
+    if header:
+        return MODES.get(header.lower())
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return 'cprofile'
+    return None
+
+
+def is_staff_request(request):
+    """
+    Authenticate with the DRF authenticators, so only staff can profile on demand.
+    Costs an auth lookup, which is why it only runs when the header is present.
+    """
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        return bool(drf_request.user and drf_request.user.is_staff)
+    except APIException:
+        return False
+
+
+def view_key(view_name):
+    # Single underscores only: "__" separates the view from the timestamp in file names
+    return re.sub(r'_+', '_', re.sub(r'[^A-Za-z0-9_.-]', '_', view_name or 'unresolved'))
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack on a timer and counts folded stacks
+    ("outer;...;inner count"), the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval=STACK_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def run_profiled(mode, view_name, call):
+    """
+    Run `call()` under the given profiler and store the result.
+    Returns (result, profile id or None). If another request is being profiled
+    in this process, runs unprofiled instead.
+    """
+    if not _profile_slot.acquire(blocking=False):
+        return call(), None
+
+    try:
+        started = time.perf_counter()
+        if mode == 'sample':
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+            try:
+                result = call()
+            finally:
+                sampler.stop()
+            outputs = {'.folded': sampler.folded().encode()}
+        else:
+            profiler = cProfile.Profile()
+            try:
+                result = profiler.runcall(call)
+            finally:
+                profiler.create_stats()
+            outputs = pstats_outputs(profiler)
+
+        wall_ms = (time.perf_counter() - started) * 1000
+        profile_id = save_profile(view_name, mode, wall_ms, outputs)
+        return result, profile_id
+    finally:
+        _profile_slot.release()
+
+
+def pstats_outputs(profiler):
+    """
+    Raw .prof (for snakeviz / pstats) plus a text summary sorted by cumulative time.
+    """
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats('cumulative').print_stats(PSTATS_LINES)
+    # Same format as pstats.Stats.dump_stats()
+    return {'.prof': marshal.dumps(stats.stats), '.txt': stream.getvalue().encode()}
+
+
+def save_profile(view_name, mode, wall_ms, outputs):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = f"{view_key(view_name)}__{int(time.time() * 1000)}_{os.getpid()}"
+    header = f"# view={view_name} mode={mode} wall_ms={wall_ms:.1f}\n".encode()
+    for extension, data in outputs.items():
+        path = os.path.join(PROFILE_DIR, stem + extension)
+        with open(path, 'wb') as handle:
+            # Binary .prof stays loadable by pstats; text outputs get a descriptive first line
+            handle.write(data if extension == '.prof' else header + data)
+    prune_profiles(view_key(view_name))
+    return stem + EXTENSIONS[mode][-1]
+
+
+def list_profiles():
+    """
+    Stored profile files, newest first.
+    """
+    try:
+        names = [name for name in os.listdir(PROFILE_DIR) if PROFILE_ID_PATTERN.match(name)]
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in names:
+        view, _, rest = name.partition('__')
+        stamp = rest.split('_', 1)[0]
+        path = os.path.join(PROFILE_DIR, name)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            continue  # Pruned meanwhile
+        profiles.append({'id': name, 'view': view, 'created_ms': int(stamp), 'bytes': size})
+    profiles.sort(key=lambda profile: profile['created_ms'], reverse=True)
+    return profiles
+
+
+def profile_path(profile_id):
+    """
+    Filesystem path of a stored profile, or None for unknown / malformed ids.
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, profile_id)
+    return path if os.path.exists(path) else None
+
+
+def prune_profiles(view):
+    """
+    Keep the newest PROFILE_MAX_PER_VIEW runs for `view` and PROFILE_MAX_STORED runs overall.
+    A run is all files sharing one stem (.prof + .txt).
+    """
+    runs = {}
+    for profile in list_profiles():
+        stem = profile['id'].rsplit('.', 1)[0]
+        runs.setdefault(stem, profile)
+
+    ordered = sorted(runs.items(), key=lambda item: item[1]['created_ms'], reverse=True)
+    view_runs = [stem for stem, profile in ordered if profile['view'] == view]
+    doomed = set(view_runs[PROFILE_MAX_PER_VIEW:])
+    doomed.update(stem for stem, _ in ordered[PROFILE_MAX_STORED:])
+
+    for stem in doomed:
+        for extension in ('.prof', '.txt', '.folded'):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, stem + extension))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,219 @@
+import hashlib
+import os
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.timezone import now
+from PIL import Image, ImageOps
+from rest_framework.exceptions import ValidationError
+
+from core.models import ReceiptUpload, Reservation
+from core.tasks import enqueue
+
+# ------------------------------
+# Receipt Image Pipeline
+# ------------------------------
+
+RECEIPT_MAX_DIMENSION = getattr(settings, 'RECEIPT_MAX_DIMENSION', 1600)     # px, longest side
+RECEIPT_MAX_BYTES = getattr(settings, 'RECEIPT_MAX_BYTES', 300 * 1024)       # size budget per receipt
+RECEIPT_FORMAT = getattr(settings, 'RECEIPT_FORMAT', 'JPEG')                 # 'JPEG' or 'WEBP'
+RECEIPT_THUMBNAIL_SIZE = getattr(settings, 'RECEIPT_THUMBNAIL_SIZE', (200, 200))
+RECEIPT_MAX_UPLOAD_BYTES = getattr(settings, 'RECEIPT_MAX_UPLOAD_BYTES', 20 * 1024 * 1024)  # raw upload limit
+RECEIPT_MAX_PIXELS = getattr(settings, 'RECEIPT_MAX_PIXELS', 50_000_000)    # width * height of the upload
+
+EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp'}
+QUALITY_STEPS = [85, 75, 65, 55, 45]
+
+
+def validate_receipt_image(upload):
+    """
+    Reject uploads that are too large or not a decodable image, before anything is stored.
+    Only the header is read for the pixel limit, so decompression bombs are never decoded.
+    Raises ValidationError (400).
+    """
+    if upload.size > RECEIPT_MAX_UPLOAD_BYTES:
+        raise ValidationError({'receipt': f"Receipts are limited to {RECEIPT_MAX_UPLOAD_BYTES} bytes."})
+    try:
+        with Image.open(upload) as image:
+            width, height = image.size
+            if width * height > RECEIPT_MAX_PIXELS:
+                raise ValidationError({'receipt': f"Receipts are limited to {RECEIPT_MAX_PIXELS} pixels."})
+            image.verify()
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        raise ValidationError({'receipt': "Upload a valid image."})
+    finally:
+        upload.seek(0)
+
+
+def receipt_digest(upload):
+    """
+    SHA-256 of an uploaded file, read in chunks so large photos are not loaded at once.
+    """
+    digest = hashlib.sha256()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    upload.seek(0)
+    return digest.hexdigest()
+
+
+def encode(image, quality):
+    buffer = BytesIO()
+    image.save(buffer, format=RECEIPT_FORMAT, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def encode_within_budget(image):
+    """
+    Re-encode at decreasing quality, then at smaller sizes, until under RECEIPT_MAX_BYTES.
+    Returns the smallest attempt if the budget cannot be met.
+    """
+    data = None
+    for _ in range(4):
+        for quality in QUALITY_STEPS:
+            data = encode(image, quality)
+            if len(data) <= RECEIPT_MAX_BYTES:
+                return data
+        image = image.resize((max(1, image.width * 3 // 4), max(1, image.height * 3 // 4)), Image.LANCZOS)
+    return data
+
+
+def save_once(storage, name, data):
+    """
+    Content-addressed save: identical receipts share one file.
+    """
+    if not storage.exists(name):
+        name = storage.save(name, ContentFile(data))
+    return name
+
+
+def process_receipt(reservation_id):
+    """
+    Downscale and recompress a reservation's uploaded receipt, write a thumbnail,
+    and replace the raw upload with the processed file.
+    Runs as a queued task; exceptions propagate so the worker retries it.
+    """
+    reservation = Reservation.objects.filter(pk=reservation_id).first()
+    if reservation is None or not reservation.receipt or not reservation.receipt_hash:
+        return
+
+    raw_name = reservation.receipt.name
+    with reservation.receipt.open('rb') as raw:
+        image = Image.open(raw)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+    image.thumbnail((RECEIPT_MAX_DIMENSION, RECEIPT_MAX_DIMENSION), Image.LANCZOS)
+    thumbnail = image.copy()
+    thumbnail.thumbnail(RECEIPT_THUMBNAIL_SIZE, Image.LANCZOS)
+
+    extension = EXTENSIONS[RECEIPT_FORMAT]
+    storage = reservation.receipt.storage
+    receipt_name = save_once(
+        storage, f"receipts/{reservation.receipt_hash}.{extension}", encode_within_budget(image)
+    )
+    thumbnail_name = save_once(
+        storage, f"receipts/thumbs/{reservation.receipt_hash}.{extension}", encode(thumbnail, 70)
+    )
+
+    # Only touch the receipt columns, and only if no newer upload replaced this one meanwhile
+    updated = Reservation.objects.filter(pk=reservation_id, receipt=raw_name).update(
+        receipt=receipt_name,
+        receipt_thumbnail=thumbnail_name,
+    )
+    if updated and raw_name != receipt_name:
+        storage.delete(raw_name)
+
+
+def attach_receipt(reservation, upload):
+    """
+    Attach an uploaded receipt file to a reservation and set it to 'Processing'.
+    Identical images are deduplicated by hash; new ones are processed in the background.
+    Returns False if this exact receipt was already attached.
+    Raises ValidationError (400) for uploads that are not an acceptable image.
+    """
+    validate_receipt_image(upload)
+    digest = receipt_digest(upload)
+    if reservation.receipt and reservation.receipt_hash == digest:
+        return False
+
+    duplicate = (
+        Reservation.objects
+        .filter(receipt_hash=digest)
+        .exclude(receipt_thumbnail='')
+        .exclude(receipt_thumbnail__isnull=True)
+        .first()
+    )
+
+    reservation.receipt_hash = digest
+    reservation.status = 'Processing'
+    if duplicate:
+        # Same image already processed: point at the stored files, nothing to write
+        reservation.receipt = duplicate.receipt.name
+        reservation.receipt_thumbnail = duplicate.receipt_thumbnail.name
+        reservation.save()
+    else:
+        reservation.receipt = upload
+        reservation.receipt_thumbnail = None
+        reservation.save()
+        schedule_receipt_processing(reservation.pk)
+    return True
+
+
+def schedule_receipt_processing(reservation_id):
+    """
+    Queue processing for the task worker (`manage.py run_tasks`), so the request returns quickly.
+    """
+    enqueue('core.receipts.process_receipt', reservation_id)
+
+
+# ------------------------------
+# Chunked Upload Expiry
+# ------------------------------
+
+# Unfinished chunked uploads are discarded this long after they were started.
+RECEIPT_UPLOAD_TTL = timedelta(hours=getattr(settings, 'RECEIPT_UPLOAD_TTL_HOURS', 24))
+
+
+def upload_expired(upload):
+    return upload.created_at <= now() - RECEIPT_UPLOAD_TTL
+
+
+def discard_upload(upload):
+    try:
+        os.remove(upload.part_path)
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def prune_expired_uploads():
+    """
+    Discard chunked uploads older than RECEIPT_UPLOAD_TTL, plus .part files of the
+    same age left without a row (e.g. the reservation was deleted mid-upload).
+    Returns the number of uploads and files removed.
+    """
+    cutoff = now() - RECEIPT_UPLOAD_TTL
+    expired = list(ReceiptUpload.objects.filter(created_at__lt=cutoff))
+    for upload in expired:
+        discard_upload(upload)
+
+    directory = os.path.join(settings.MEDIA_ROOT, 'uploads')
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return len(expired)
+    live = {str(upload_id) for upload_id in ReceiptUpload.objects.values_list('upload_id', flat=True)}
+    stray = 0
+    for name in names:
+        path = os.path.join(directory, name)
+        if not name.endswith('.part') or name[:-len('.part')] in live:
+            continue
+        try:
+            if os.path.getmtime(path) < cutoff.timestamp():
+                os.remove(path)
+                stray += 1
+        except FileNotFoundError:
+            pass  # Removed meanwhile
+    return len(expired) + stray
@@ -0,0 +1,172 @@
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils.timezone import now
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# ------------------------------
+# Refresh Token Revocation
+# ------------------------------
+
+# How stale this process's view of the blacklist may get. Tokens revoked in this
+# process are seen at once; revocations from other processes within this many seconds.
+REVOCATION_SYNC_SECONDS = getattr(settings, 'REVOCATION_SYNC_SECONDS', 10)
+REVOCATION_SYNC_OVERLAP = 60  # Seconds of already-synced rows re-read each sync
+# Full rebuilds drop pruned entries and resize the filter as the blacklist grows.
+REVOCATION_REBUILD_SECONDS = 60 * 60
+REVOCATION_FALSE_POSITIVE_RATE = 0.001
+REVOCATION_MIN_CAPACITY = 10000
+PRUNE_BATCH_SIZE = 5000
+
+
+class BloomFilter:
+    """
+    Set membership with no false negatives: `key in bloom` is False only for keys never added.
+    """
+
+    def __init__(self, capacity, error_rate=REVOCATION_FALSE_POSITIVE_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))  # Double hashing
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationFilter:
+    """
+    In-process Bloom filter of blacklisted refresh token jtis, kept in step with
+    BlacklistedToken by incremental syncs over its primary key.
+    A negative answer skips the database entirely; a positive one is confirmed
+    against the table, so false positives only cost the query the check used to make.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._synced_at = 0.0
+        self._built_at = 0.0
+        self._checkpoints = deque()  # (synced_at, highest id seen) of recent syncs
+
+    def might_be_revoked(self, jti):
+        if self._bloom is None or time.monotonic() - self._synced_at >= REVOCATION_SYNC_SECONDS:
+            self.sync()
+        return jti in self._bloom
+
+    def add(self, jti):
+        """
+        Record a revocation made by this process right away.
+        """
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def sync(self):
+        with self._lock:
+            current = time.monotonic()
+            if self._bloom is not None and current - self._synced_at < REVOCATION_SYNC_SECONDS:
+                return  # Another thread synced while we waited
+
+            rebuild = (
+                self._bloom is None
+                or current - self._built_at >= REVOCATION_REBUILD_SECONDS
+                or self._bloom.count >= self._bloom.capacity
+            )
+            # Ids come from a sequence, so a slow transaction can commit a lower id after
+            # a higher one was read: incremental syncs re-read from a checkpoint at least
+            # REVOCATION_SYNC_OVERLAP old.
+            while len(self._checkpoints) > 1 and current - self._checkpoints[1][0] >= REVOCATION_SYNC_OVERLAP:
+                self._checkpoints.popleft()
+
+            rows = BlacklistedToken.objects.order_by('id').values_list('id', 'token__jti')
+            if rebuild:
+                bloom = BloomFilter(max(REVOCATION_MIN_CAPACITY, BlacklistedToken.objects.count() * 2))
+                self._built_at = current
+            else:
+                bloom = self._bloom
+                rows = rows.filter(id__gt=self._checkpoints[0][1])
+
+            last_id = self._checkpoints[-1][1] if self._checkpoints else 0
+            for row_id, jti in rows.iterator(chunk_size=PRUNE_BATCH_SIZE):
+                if jti not in bloom:
+                    bloom.add(jti)
+                last_id = max(last_id, row_id)
+
+            self._checkpoints.append((current, last_id))
+            self._bloom, self._synced_at = bloom, current
+
+
+revocation_filter = RevocationFilter()
+
+
+class FilteredRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check goes through `revocation_filter` first,
+    so the common not-revoked case needs no database round trip.
+    """
+
+    def check_blacklist(self):
+        if revocation_filter.might_be_revoked(self.payload[jwt_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        revocation_filter.add(self.payload[jwt_settings.JTI_CLAIM])
+        return result
+
+
+def revoke_user_tokens(user):
+    """
+    Blacklist every unexpired refresh token issued to `user` in one bulk insert.
+    Their access tokens are refused through the account state check (core/authentication.py).
+    """
+    outstanding = list(
+        OutstandingToken.objects
+        .filter(user=user, expires_at__gt=now(), blacklistedtoken__isnull=True)
+        .values_list('id', 'jti')
+    )
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token_id=token_id) for token_id, _ in outstanding],
+        ignore_conflicts=True,
+    )
+    for _, jti in outstanding:
+        revocation_filter.add(jti)
+    return len(outstanding)
+
+
+def prune_expired_tokens(batch_size=PRUNE_BATCH_SIZE):
+    """
+    Delete expired outstanding tokens and their blacklist rows in id-ordered batches,
+    so no single statement or transaction grows with the table.
+    An expired refresh token is rejected on its own, so its blacklist row is dead weight.
+    """
+    expired = OutstandingToken.objects.filter(expires_at__lte=now())
+    deleted = 0
+    while True:
+        boundary = list(expired.order_by('id').values_list('id', flat=True)[batch_size - 1:batch_size])
+        upper = boundary[0] if boundary else None
+        batch = expired.filter(id__lte=upper) if upper is not None else expired
+        BlacklistedToken.objects.filter(token__in=batch.values('id')).delete()
+        count, _ = batch.delete()
+        deleted += count
+        if upper is None:
+            return deleted
@@ -0,0 +1,168 @@
+from datetime import datetime, time
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils.timezone import localdate, make_aware
+
+from core.models import DailyLocationStats, ParkingSlot, Reservation
+
+# ------------------------------
+# Daily Location Stats Rollup
+# ------------------------------
+
+# Statuses counted as "in use" by the overall utilization summary.
+ACTIVE_STATUSES = ['Reserved', 'Active']
+
+ROLLUP_FIELDS = ['reservations', 'active_reservations', 'check_ins', 'check_outs']
+
+
+def reservation_snapshot(location_id, start_time, status, last_park_in, last_park_out):
+    """
+    Reduce a reservation to its rollup bucket and the counts it contributes there.
+    Returns ((location_id, date), {field: 0/1}).
+    """
+    bucket = (location_id, localdate(start_time))
+    counts = {
+        'reservations': 1,
+        'active_reservations': int(status in ACTIVE_STATUSES),
+        'check_ins': int(last_park_in is not None),
+        'check_outs': int(last_park_out is not None),
+    }
+    return bucket, counts
+
+
+def snapshot_for_instance(reservation):
+    return reservation_snapshot(
+        reservation.slot.location_id,
+        reservation.start_time,
+        reservation.status,
+        reservation.last_park_in,
+        reservation.last_park_out,
+    )
+
+
+def snapshot_from_loaded(reservation):
+    """
+    Snapshot of the row as it was loaded (Reservation.rollup_state), without re-reading it.
+    The location comes from the slot; only a move to another slot costs a lookup.
+    """
+    loaded = reservation._rollup_loaded
+    if loaded['slot_id'] == reservation.slot_id:
+        location_id = reservation.slot.location_id
+    else:
+        location_id = (
+            ParkingSlot.objects
+            .filter(pk=loaded['slot_id'])
+            .values_list('location_id', flat=True)
+            .first()
+        )
+    return reservation_snapshot(
+        location_id,
+        loaded['start_time'],
+        loaded['status'],
+        loaded['last_park_in'],
+        loaded['last_park_out'],
+    )
+
+
+def snapshot_from_db(pk):
+    """
+    Snapshot of the stored row, taken before it is overwritten.
+    """
+    row = (
+        Reservation.objects
+        .filter(pk=pk)
+        .values('slot__location_id', 'start_time', 'status', 'last_park_in', 'last_park_out')
+        .first()
+    )
+    if row is None:
+        return None
+    return reservation_snapshot(
+        row['slot__location_id'],
+        row['start_time'],
+        row['status'],
+        row['last_park_in'],
+        row['last_park_out'],
+    )
+
+
+def apply_delta(bucket, deltas):
+    """
+    Add deltas to a (location_id, date) row with a single F() UPDATE.
+    Increments create the row on first use; decrements never do.
+    """
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+
+    location_id, date = bucket
+    rows = DailyLocationStats.objects.filter(location_id=location_id, date=date)
+    updates = {field: F(field) + value for field, value in deltas.items()}
+
+    if rows.update(**updates) or any(value < 0 for value in deltas.values()):
+        return
+
+    DailyLocationStats.objects.get_or_create(location_id=location_id, date=date)
+    rows.update(**updates)
+
+
+def record_change(old, new):
+    """
+    Move a reservation's contribution from its old snapshot to its new one.
+    Either side may be None (create / delete).
+    """
+    if old == new:
+        return
+
+    if old and new and old[0] == new[0]:
+        bucket = new[0]
+        apply_delta(bucket, {field: new[1][field] - old[1][field] for field in ROLLUP_FIELDS})
+        return
+
+    if old:
+        apply_delta(old[0], {field: -value for field, value in old[1].items()})
+    if new:
+        apply_delta(new[0], new[1])
+
+
+def rebuild_daily_stats(since=None):
+    """
+    Recompute rollup rows from the raw reservation table in one grouped query.
+    If `since` (a date) is given, only buckets on or after that day are rebuilt.
+    Returns the number of rows written.
+    """
+    reservations = Reservation.objects.annotate(day=TruncDate('start_time'))
+    existing = DailyLocationStats.objects.all()
+    if since is not None:
+        reservations = reservations.filter(start_time__gte=make_aware(datetime.combine(since, time.min)))
+        existing = existing.filter(date__gte=since)
+
+    grouped = (
+        reservations
+        .values('slot__location_id', 'day')
+        .annotate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status__in=ACTIVE_STATUSES)),
+            parked_in=Count('last_park_in'),
+            parked_out=Count('last_park_out'),
+        )
+        .order_by()
+    )
+
+    rows = [
+        DailyLocationStats(
+            location_id=row['slot__location_id'],
+            date=row['day'],
+            reservations=row['total'],
+            active_reservations=row['active'],
+            check_ins=row['parked_in'],
+            check_outs=row['parked_out'],
+        )
+        for row in grouped
+    ]
+
+    with transaction.atomic():
+        existing.delete()
+        DailyLocationStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -1,8 +1,72 @@
-from datetime import timezone
+from django.utils import timezone
 from rest_framework import serializers, generics, status, permissions
 from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import F, Prefetch
 from core.models import ParkingLocation, ParkingSlot, Reservation
+from core.availability import is_slot_available
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from core.authentication import account_states, add_account_claims
+from core.revocation import FilteredRefreshToken
+
+# ------------------------------
+# Sparse Fieldsets / Compact Mode
+# ------------------------------
+
+class DynamicFieldsMixin:
+    """
+    Lets list clients trim payloads via query params:
+    - ?fields=a,b,c   keep only these fields
+    - ?expand=x,y     render only these nested relations in full; the rest in
+                      `collapsed_fields` become ids. Without ?expand everything stays nested.
+    Only applies to read requests (GET/HEAD/OPTIONS) that pass the request in the
+    serializer context, so writes always validate and save every field, and nested
+    (class-level) usages are unaffected. Unknown names in ?fields= are ignored.
+    """
+    collapsed_fields = {}  # field name -> callable returning the id-only replacement field
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return
+        params = request.query_params
+
+        requested = _split_param(params.get('fields'))
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+        if 'expand' in params:
+            expanded = _split_param(params.get('expand'))
+            for name, make_field in self.collapsed_fields.items():
+                if name in self.fields and name not in expanded:
+                    self.fields[name] = make_field()
+
+
+def _split_param(value):
+    return {part.strip() for part in (value or '').split(',') if part.strip()}
+
+
+def wants_compact(request):
+    """
+    True if the client asked for the columnar response (?compact=1).
+    """
+    return request.query_params.get('compact') in ('1', 'true')
+
+
+def to_columnar(names, items):
+    """
+    Columnar JSON: field names once, then one array per serialized item.
+    """
+    return {
+        "fields": names,
+        "rows": [[item[name] for name in names] for item in items],
+    }
+
 
 # ------------------------------
 # Auth / User Serializers
@@ -32,13 +96,51 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login serializer (SIMPLE_JWT['TOKEN_OBTAIN_SERIALIZER']): adds the account claims
+    ClaimsJWTAuthentication builds request.user from. Refreshed access tokens inherit them.
+    """
+    token_class = FilteredRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        return add_account_claims(super().get_token(user), user)
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh (SIMPLE_JWT['TOKEN_REFRESH_SERIALIZER']) without database round trips
+    in the common case: the blacklist check goes through the in-process revocation filter
+    and the account checks through the cached account state.
+    The new access token's staff/superuser claims are re-stamped from the current account
+    state, so a demoted admin's tokens stop claiming it from the next refresh on.
+    """
+    token_class = FilteredRefreshToken
+
+    def validate(self, attrs):
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            return super().validate(attrs)  # Rotation writes tokens anyway
+
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        access = refresh.access_token
+        if user_id:
+            state = account_states.get(user_id)
+            if not state.is_active:
+                raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+            if 'is_staff' in access:
+                access['is_staff'], access['is_superuser'] = state.is_staff, state.is_superuser
+        return {"access": str(access)}
         
         
 # ------------------------------
 # Parking Slot Serializers
 # ------------------------------
 
-class ParkingSlotSerializer(serializers.ModelSerializer):
+class ParkingSlotSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for individual parking slots.
     Used in admin panel and slot listings.
@@ -49,19 +151,40 @@ class ParkingSlotSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'slot_id']
         
 class ParkingSlotWithCurrentReservationSerializer(serializers.ModelSerializer):
+    """
+    Slot with the reservation currently parked in it (checked in, not yet out).
+    Expects `current_reservations` to be prefetched via `current_reservation_prefetch()`;
+    falls back to a per-slot query otherwise.
+    """
     current_reservation = serializers.SerializerMethodField()
 
     class Meta:
         model = ParkingSlot
         fields = ['id', 'slot_id', 'locked', 'current_reservation']
 
+    @staticmethod
+    def current_reservation_prefetch():
+        """
+        Loads current reservations for a whole slot queryset in one extra query.
+        """
+        return Prefetch(
+            'reservation_set',
+            queryset=Reservation.objects.filter(
+                last_park_in__lte=timezone.now(),
+                last_park_out__isnull=True  # means currently parked
+            ).select_related('user').order_by('-last_park_in'),
+            to_attr='current_reservations',
+        )
+
     def get_current_reservation(self, slot):
-        now = timezone.now()
-        reservation = Reservation.objects.filter(
-            slot=slot,
-            last_park_in__lte=now,
-            last_park_out__isnull=True  # means currently parked
-        ).select_related('user').first()
+        if hasattr(slot, 'current_reservations'):
+            reservation = slot.current_reservations[0] if slot.current_reservations else None
+        else:
+            reservation = Reservation.objects.filter(
+                slot=slot,
+                last_park_in__lte=timezone.now(),
+                last_park_out__isnull=True
+            ).select_related('user').order_by('-last_park_in').first()
 
         if reservation:
             return {
@@ -71,8 +194,8 @@ class ParkingSlotWithCurrentReservationSerializer(serializers.ModelSerializer):
                     "email": reservation.user.email,
                 },
                 "car": {
-                    "make": reservation.car_make,
-                    "model": reservation.car_model,
+                    "make": reservation.vehicle_make,
+                    "model": reservation.vehicle_model,
                     "plate_number": reservation.plate_number,
                     "vehicle_type": reservation.vehicle_type,
                 },
@@ -81,6 +204,38 @@ class ParkingSlotWithCurrentReservationSerializer(serializers.ModelSerializer):
         return None
 
 
+class SlotProvisionSerializer(serializers.Serializer):
+    """
+    Input for bulk slot provisioning.
+    Slots are labelled `<prefix>-<number>` with zero padding, e.g. B1-001..B1-250.
+    - create: adds the labelled slots (reopening any retired ones with the same label).
+    - retire: closes `count` open slots with no upcoming reservations, highest labels first.
+    """
+    ACTION_CHOICES = ['create', 'retire']
+    MAX_COUNT = 5000
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    count = serializers.IntegerField(min_value=1, max_value=MAX_COUNT)
+    prefix = serializers.CharField(max_length=6, required=False, allow_blank=True, default='')
+    start = serializers.IntegerField(min_value=0, required=False, default=1)
+    width = serializers.IntegerField(min_value=1, max_value=6, required=False, default=3)
+
+    @staticmethod
+    def slot_label(prefix, number, width):
+        label = f"{number:0{width}d}"
+        return f"{prefix}-{label}" if prefix else label
+
+    def validate(self, data):
+        if data['action'] == 'create':
+            last_label = self.slot_label(data['prefix'], data['start'] + data['count'] - 1, data['width'])
+            max_length = ParkingSlot._meta.get_field('floorzone_number').max_length
+            if len(last_label) > max_length:
+                raise serializers.ValidationError(
+                    f"Slot label '{last_label}' exceeds {max_length} characters."
+                )
+        return data
+
+
 # ------------------------------
 # Parking Location Serializers
 # ------------------------------
@@ -90,12 +245,30 @@ class ParkingLocationSerializer(serializers.ModelSerializer):
     Basic parking location serializer.
     Includes the total number of slots and optional Google Maps info.
     """
-    slot_ids = serializers.ReadOnlyField()
+    slot_ids = serializers.SerializerMethodField()
 
     class Meta:
         model = ParkingLocation
         fields = ['id', 'name', 'address', 'google_maps_url', 'latitude', 'longitude', 'slot_ids', 'slots']
 
+    @staticmethod
+    def slot_ids_prefetch():
+        """
+        Loads slot UUIDs for a whole location queryset into `prefetched_slots`
+        in one extra query, instead of one `slot_ids` query per location.
+        """
+        return Prefetch(
+            'parkingslot_set',
+            queryset=ParkingSlot.objects.only('id', 'location_id', 'slot_id').order_by('id'),
+            to_attr='prefetched_slots',
+        )
+
+    def get_slot_ids(self, location):
+        prefetched = getattr(location, 'prefetched_slots', None)
+        if prefetched is None:  # Queryset without slot_ids_prefetch()
+            return location.slot_ids
+        return [slot.slot_id for slot in prefetched]
+
 class ParkingLocationShortSerializer(serializers.ModelSerializer):
     """
     Short version of ParkingLocation used in nested representations (e.g. reservations).
@@ -128,10 +301,19 @@ class ParkingLocationWithSlotsSerializer(serializers.ModelSerializer):
 # Reservation Serializers
 # ------------------------------
 
-class ReservationAdminSerializer(serializers.ModelSerializer):
+class ReservationAdminSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Admin reservation view with nested user and slot.
+    Supports ?fields= and ?expand=user,slot (collapsed relations render as ids).
+    """
     user = UserSerializer(read_only=True)
     slot = ParkingSlotSerializer(read_only=True)
 
+    collapsed_fields = {
+        'user': lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+        'slot': lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+    }
+
     class Meta:
         model = Reservation
         fields = [
@@ -178,31 +360,58 @@ class ReservationSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """
-        Ensure slot is available before allowing reservation.
+        Ensure the slot is free for the requested [start_time, end_time) window.
         """
         slot = data.get('slot')
-        if slot and not slot.is_available:
-            raise serializers.ValidationError("Selected slot is not available.")
+        start_time = data.get('start_time')
+        end_time = data.get('end_time')
+
+        if start_time and end_time and start_time >= end_time:
+            raise serializers.ValidationError("start_time must be before end_time.")
+        if slot and start_time and end_time and not is_slot_available(
+            slot, start_time, end_time, exclude_reservation=self.instance
+        ):
+            raise serializers.ValidationError("Selected slot is not available for this time window.")
         return data
     
     def create(self, validated_data):
         """
-        Override to set initial status and perform any needed logic.
+        Book the slot atomically.
+        The slot row is locked (SELECT ... FOR UPDATE) while the window is re-checked,
+        so concurrent requests for the same slot are serialized and only one can win.
+        SQLite has no row locks: a no-op UPDATE as the first statement takes the
+        database write lock instead, which also serializes the re-check.
         """
-        reservation = Reservation.objects.create(
-            **validated_data,
-            status='processing'  # Ensure initial status is set
-        )
+        slot_pk = validated_data['slot'].pk
+        with transaction.atomic():
+            if connection.features.has_select_for_update:
+                slot = ParkingSlot.objects.select_for_update().get(pk=slot_pk)
+            else:
+                ParkingSlot.objects.filter(pk=slot_pk).update(locked=F('locked'))
+                slot = ParkingSlot.objects.get(pk=slot_pk)
+            if not is_slot_available(slot, validated_data['start_time'], validated_data['end_time']):
+                raise serializers.ValidationError("Selected slot is not available for this time window.")
+
+            validated_data['slot'] = slot
+            reservation = Reservation.objects.create(
+                **validated_data,
+                status='Pending'  # No receipt uploaded yet
+            )
         return reservation
 
-class ReservationListSerializer(serializers.ModelSerializer):
+class ReservationListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     List-style reservation serializer for user dashboard.
     Includes human-readable slot ID and location info.
+    Supports ?fields= and ?expand=location (collapsed location renders as its id).
     """
     slot_id = serializers.CharField(source='slot.slot_id', read_only=True)
     location = serializers.SerializerMethodField()
 
+    collapsed_fields = {
+        'location': lambda: serializers.IntegerField(source='slot.location_id', read_only=True),
+    }
+
     class Meta:
         model = Reservation
         fields = [
@@ -0,0 +1,114 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import ParkingLocation, ParkingSlot, Reservation
+from core.rollups import record_change, snapshot_for_instance, snapshot_from_db, snapshot_from_loaded
+from core.events import publish_on_commit, reservation_event, slot_event
+from core.cache import bump_location
+from core.metrics import install_query_recorder
+from core.db import configure_sqlite
+from core.authentication import account_states
+
+# ------------------------------
+# Reservation Rollup Signals
+# ------------------------------
+
+@receiver(pre_save, sender=Reservation)
+def capture_reservation_snapshot(sender, instance, raw=False, **kwargs):
+    """
+    Remember the stored state so post_save can apply only the difference.
+    Instances loaded from the database already carry it (Reservation.from_db);
+    only one built by hand with a pk, or with deferred rollup fields, re-reads the row.
+    """
+    if raw:
+        return
+    if getattr(instance, '_rollup_loaded', None) is not None:
+        instance._rollup_snapshot = snapshot_from_loaded(instance)
+    else:
+        instance._rollup_snapshot = snapshot_from_db(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=Reservation)
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    record_change(getattr(instance, '_rollup_snapshot', None), snapshot_for_instance(instance))
+    instance._rollup_loaded = instance.rollup_state()  # The next save diffs against this one
+
+
+@receiver(post_delete, sender=Reservation)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    record_change(snapshot_for_instance(instance), None)
+
+
+# ------------------------------
+# Live Event Signals
+# ------------------------------
+
+@receiver(post_save, sender=ParkingSlot)
+def publish_slot_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    publish_on_commit(instance.location_id, slot_event(instance))
+
+
+@receiver(post_save, sender=Reservation)
+def publish_reservation_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    publish_on_commit(instance.slot.location_id, reservation_event(instance))
+
+
+@receiver(post_delete, sender=Reservation)
+def publish_reservation_delete(sender, instance, **kwargs):
+    publish_on_commit(instance.slot.location_id, reservation_event(instance, deleted=True))
+
+
+# ------------------------------
+# Read Cache Invalidation
+# ------------------------------
+# Location and slot representations do not depend on reservations,
+# so only location/slot writes invalidate the read cache.
+
+@receiver(post_save, sender=ParkingLocation)
+@receiver(post_delete, sender=ParkingLocation)
+def invalidate_location_cache(sender, instance, **kwargs):
+    location_id = instance.pk
+    transaction.on_commit(lambda: bump_location(location_id))
+
+
+@receiver(post_save, sender=ParkingSlot)
+@receiver(post_delete, sender=ParkingSlot)
+def invalidate_slot_cache(sender, instance, **kwargs):
+    location_id = instance.location_id
+    transaction.on_commit(lambda: bump_location(location_id))
+
+
+# ------------------------------
+# Request Metrics
+# ------------------------------
+
+connection_created.connect(install_query_recorder, dispatch_uid='core.metrics.install_query_recorder')
+
+
+# ------------------------------
+# Database Connection Setup
+# ------------------------------
+
+connection_created.connect(configure_sqlite, dispatch_uid='core.db.configure_sqlite')
+
+
+# ------------------------------
+# Account State Invalidation
+# ------------------------------
+# Token auth reads active/staff/superuser from core.authentication.account_states,
+# so any saved change (deactivation, demotion, Django admin edits) applies at once here.
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_account_state(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: account_states.invalidate(user_id))
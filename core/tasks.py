@@ -0,0 +1,133 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+from core.models import Task
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------
+# DB-Backed Task Queue
+# ------------------------------
+
+# Workers refresh locked_at on their running tasks this often (see heartbeat()).
+HEARTBEAT_SECONDS = 60
+# Running tasks with no heartbeat for this long lost their worker and are requeued.
+STALE_TASK_TIMEOUT = timedelta(minutes=10)
+# Retry delay is BACKOFF_BASE_SECONDS * 2^(attempt - 1), capped at BACKOFF_MAX_SECONDS.
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 15 * 60
+
+
+def enqueue(func_path, *args, max_attempts=5, delay=None):
+    """
+    Queue `func_path(*args)` for a worker.
+    The row is written in the caller's transaction, so the task only becomes
+    visible once the change that produced it commits.
+    """
+    return Task.objects.create(
+        name=func_path,
+        args=list(args),
+        max_attempts=max_attempts,
+        run_after=now() + (delay or timedelta()),
+    )
+
+
+def claim_tasks(worker_id, limit):
+    """
+    Atomically mark up to `limit` due tasks as Running for this worker.
+    Postgres: SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never wait on each other.
+    SQLite (no row locks): per-row conditional UPDATE; the database write lock makes it a safe claim.
+    """
+    current_time = now()
+    due = Task.objects.filter(status='Queued', run_after__lte=current_time).order_by('run_after', 'id')
+    claim = {
+        'status': 'Running',
+        'locked_by': worker_id,
+        'locked_at': current_time,
+        'attempts': F('attempts') + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            Task.objects.filter(id__in=ids).update(**claim)
+    else:
+        ids = [
+            task_id
+            for task_id in due.values_list('id', flat=True)[:limit]
+            if Task.objects.filter(id=task_id, status='Queued').update(**claim)
+        ]
+
+    return list(Task.objects.filter(id__in=ids, locked_by=worker_id, status='Running'))
+
+
+def heartbeat(worker_id):
+    """
+    Refresh locked_at on every task this worker is running, so long tasks are
+    not mistaken for orphans. One UPDATE per call, however many tasks are running.
+    """
+    return Task.objects.filter(status='Running', locked_by=worker_id).update(locked_at=now())
+
+
+def requeue_stale_tasks():
+    """
+    Return tasks orphaned by a crashed worker to the queue.
+    The lost run already counted as an attempt when it was claimed, so a task that
+    keeps killing its worker is dead-lettered after max_attempts instead of looping forever.
+    """
+    current_time = now()
+    stale = Task.objects.filter(status='Running', locked_at__lt=current_time - STALE_TASK_TIMEOUT)
+    released = {'locked_by': '', 'locked_at': None, 'updated_at': current_time}
+
+    dead = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='Dead',
+        last_error=f"Worker stopped without finishing the task (no heartbeat for {STALE_TASK_TIMEOUT}).",
+        **released,
+    )
+    if dead:
+        logger.error("%s stale task(s) dead after max_attempts", dead)
+    return stale.update(status='Queued', **released)
+
+
+def run_task(task):
+    """
+    Execute one claimed task, then record success, schedule a retry, or dead-letter it.
+    """
+    try:
+        import_string(task.name)(*task.args)
+    except Exception:
+        error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            logger.error("Task %s (%s) dead after %s attempts", task.id, task.name, task.attempts)
+            Task.objects.filter(id=task.id).update(
+                status='Dead', last_error=error, locked_by='', locked_at=None, updated_at=now()
+            )
+        else:
+            delay = min(BACKOFF_BASE_SECONDS * 2 ** (task.attempts - 1), BACKOFF_MAX_SECONDS)
+            logger.warning("Task %s (%s) failed, retrying in %ss", task.id, task.name, delay)
+            Task.objects.filter(id=task.id).update(
+                status='Queued',
+                last_error=error,
+                locked_by='',
+                locked_at=None,
+                run_after=now() + timedelta(seconds=delay),
+                updated_at=now(),
+            )
+    else:
+        Task.objects.filter(id=task.id).update(status='Done', locked_by='', locked_at=None, updated_at=now())
+    finally:
+        close_old_connections()
+
+
+def prune_done_tasks(older_than):
+    """
+    Bulk-delete finished tasks older than the given timedelta.
+    """
+    deleted, _ = Task.objects.filter(status='Done', updated_at__lt=now() - older_than).delete()
+    return deleted
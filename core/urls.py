@@ -9,6 +9,8 @@ urlpatterns = [
     path('register/', views.RegisterView.as_view(), name='register'),
     path('profile/', views.ProfileView.as_view(), name='profile'),
     path('profile/update/', views.ProfileUpdateView.as_view(), name='profile-update'),
+    path('profile/password/', views.ChangePasswordView.as_view(), name='change-password'),
+    path('logout/', views.LogoutView.as_view(), name='logout'),
 
     path('users/', views.UserListView.as_view(), name='user-list'),
     path('users/<int:id>/deactivate/', views.DeactivateUserView.as_view(), name='deactivate-user'),
@@ -20,14 +22,18 @@ urlpatterns = [
     path('locations/', views.ParkingLocationListCreateView.as_view(), name='location-list-create'),
     path('locations/<int:pk>/delete/', views.AdminDeleteLocationView.as_view(), name='admin-delete-location'),
     path('locations/search/', views.ParkingLocationSearchView.as_view(), name='location-search'),
+    path('locations/nearby/', views.ParkingLocationNearbyView.as_view(), name='location-nearby'),
     path('locations/<int:pk>/', views.ParkingLocationDetailView.as_view(), name='location-detail'),
     path('locations/<int:pk>/reservations/', views.LocationReservationsView.as_view(), name='location-reservations'),
+    path('locations/<int:pk>/slots/bulk/', views.BulkSlotProvisionView.as_view(), name='bulk-slot-provision'),
     path('locations-dashboard/', views.AdminLocationDashboardView.as_view(), name='admin-location-dashboard'),
 
     # -------------------------------
     #  Parking Slots
     # -------------------------------
     path('slots/<int:location_id>/', views.ParkingSlotListView.as_view(), name='slot-list'),
+    path('slots/<int:location_id>/available/', views.AvailableSlotListView.as_view(), name='available-slot-list'),
+    path('slots/<int:location_id>/occupancy/', views.SlotOccupancyListView.as_view(), name='slot-occupancy-list'),
     path('slots/create/', views.ParkingSlotCreateView.as_view(), name='create-slot'),
     path('slots/<int:pk>/update/', views.ParkingSlotUpdateView.as_view(), name='slot-update'),
     path('slots/<int:pk>/delete/', views.ParkingSlotDeleteView.as_view(), name='slot-delete'),
@@ -40,15 +46,24 @@ urlpatterns = [
     path('reservations/', views.ReservationCreateView.as_view(), name='reservation-create'),
     path('reservations/me/', views.MyReservationsView.as_view(), name='my-reservations'),
     path('reservations/all/', views.AllReservationsView.as_view(), name='all-reservations'),
+    path('reservations/export/', views.ReservationExportView.as_view(), name='reservation-export'),
     path('reservations/<int:pk>/', views.ReservationDetailView.as_view(), name='reservation-detail'),
 
     path('reservations/<int:pk>/status/', views.ReservationStatusUpdateView.as_view(), name='reservation-status-update'),
     path('reservations/<int:pk>/upload-receipt/', views.UploadReceiptView.as_view(), name='upload-receipt'),
+    path('reservations/<int:pk>/receipt-uploads/', views.ReceiptUploadInitView.as_view(), name='receipt-upload-init'),
+    path('receipt-uploads/<uuid:upload_id>/', views.ReceiptUploadChunkView.as_view(), name='receipt-upload-chunk'),
+    path('receipt-uploads/<uuid:upload_id>/finalize/', views.ReceiptUploadFinalizeView.as_view(), name='receipt-upload-finalize'),
     path('reservations/<int:pk>/approve/', views.ApproveReservationView.as_view(), name='reservation-approve'),
 
     path('reservations/<int:pk>/in/', views.ReservationCheckInView.as_view(), name='reservation-checkin'),
     path('reservations/<int:pk>/out/', views.ReservationCheckOutView.as_view(), name='reservation-checkout'),
 
+    # -------------------------------
+    #  Live Events (SSE)
+    # -------------------------------
+    path('events/locations/<int:location_id>/', views.LocationEventStreamView.as_view(), name='location-events'),
+
     # -------------------------------
     #  Summaries / Analytics
     # -------------------------------
@@ -62,5 +77,8 @@ urlpatterns = [
     #  System / Dev Tools
     # -------------------------------
     # path('system/healthcheck/', views.HealthCheckView.as_view(), name='health-check'),
+    path('system/metrics/', views.RequestMetricsView.as_view(), name='request-metrics'),
+    path('system/profiles/', views.ProfileListView.as_view(), name='profile-list'),
+    path('system/profiles/<str:profile_id>/', views.ProfileDownloadView.as_view(), name='profile-download'),
     path('test-cors/', views.TestCORSView.as_view(), name='test-cors'),
 ]
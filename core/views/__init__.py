@@ -4,3 +4,5 @@ from .slot_views import *
 from .reservation_views import *
 from .analytics_views import *
 from .admin_views import *
+from .event_views import *
+from .system_views import *
@@ -1,36 +1,37 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
-from rest_framework import status
+from rest_framework import generics, status
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
 
 from core.models import Reservation, ParkingLocation
 from core.serializers import UserSerializer, ReservationSerializer
+from core.pagination import UserCursorPagination
+from core.revocation import revoke_user_tokens
 
 
-class UserListView(APIView):
+class UserListView(generics.ListAPIView):
     """
-    Admin-only: Returns a list of all registered users.
+    Admin-only: Returns registered users, newest first, one cursor page at a time.
     """
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
+    pagination_class = UserCursorPagination
     permission_classes = [IsAdminUser]
 
-    def get(self, request):
-        users = User.objects.all()
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
-
 
 class DeactivateUserView(APIView):
     """
-    Admin-only: Deactivates the selected user account.
+    Admin-only: Deactivates the selected user account and revokes its refresh tokens.
     """
     permission_classes = [IsAdminUser]
 
     def post(self, request, id):
         user = get_object_or_404(User, id=id)
         user.is_active = False
-        user.save()
+        user.save()  # Token auth sees it at once (account state signal, core/signals.py)
+        revoke_user_tokens(user)  # Outstanding refresh tokens can no longer be used
         return Response({'message': 'User deactivated successfully.'}, status=status.HTTP_200_OK)
 
 
@@ -1,33 +1,57 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
+from rest_framework import status
+from django.db.models import Count, Sum
 from django.utils.timezone import now, timedelta
 
-from core.models import Reservation, ParkingLocation, ParkingSlot
+from core.models import Reservation, ParkingLocation, ParkingSlot, DailyLocationStats
+
+DEFAULT_SUMMARY_DAYS = 7
+MAX_SUMMARY_DAYS = 366
 
 
 class SlotUtilizationSummaryView(APIView):
     """
     Admin-only:
-    Returns slot utilization statistics for each parking location over the past 7 days.
+    Returns slot utilization statistics for each parking location over the past N days
+    (?days=, default 7, max 366).
     Utilization per day = (# of reservations that day) / (total slots at that location).
+    Reads the precomputed DailyLocationStats rollup plus one annotated location query,
+    so cost depends on days x locations, not on the size of the reservation table.
     """
     permission_classes = [IsAdminUser]
 
     def get(self, request):
+        try:
+            days = int(request.query_params.get("days", DEFAULT_SUMMARY_DAYS))
+        except ValueError:
+            return Response({"error": "days must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= days <= MAX_SUMMARY_DAYS:
+            return Response(
+                {"error": f"days must be between 1 and {MAX_SUMMARY_DAYS}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         today = now().date()
-        past_days = [today - timedelta(days=i) for i in range(7)]
-        data = []
+        first_day = today - timedelta(days=days - 1)
+        past_days = [first_day + timedelta(days=i) for i in range(days)]  # Oldest to newest
+
+        locations = ParkingLocation.objects.annotate(total_slots=Count('parkingslot')).order_by('id')
 
-        for location in ParkingLocation.objects.all():
-            total_slots = ParkingSlot.objects.filter(location=location).count()
+        daily_counts = (
+            DailyLocationStats.objects
+            .filter(date__gte=first_day, date__lte=today)
+            .values_list('location_id', 'date', 'reservations')
+        )
+        counts = {(location_id, date): total for location_id, date, total in daily_counts}
 
-            for date in reversed(past_days):  # Oldest to newest
-                day_reservations = Reservation.objects.filter(
-                    slot__location=location,
-                    start_time__date=date
-                ).count()
+        data = []
+        for location in locations:
+            total_slots = location.total_slots
 
+            for date in past_days:
+                day_reservations = counts.get((location.id, date), 0)
                 utilization = (day_reservations / total_slots) if total_slots else 0
 
                 data.append({
@@ -46,15 +70,15 @@ class OverallSlotUtilizationView(APIView):
     """
     Admin-only:
     Returns current overall slot utilization across all locations.
-    Based on how many slots are currently 'Reserved' or 'Active'.
+    Based on how many slots are currently 'Reserved' or 'Active' (from the daily rollup).
     """
     permission_classes = [IsAdminUser]
 
     def get(self, request):
         total_slots = ParkingSlot.objects.count()
-        active_reservations = Reservation.objects.filter(
-            status__in=["Reserved", "Active"]
-        ).count()
+        active_reservations = DailyLocationStats.objects.aggregate(
+            total=Sum('active_reservations')
+        )['total'] or 0
 
         utilization_rate = (active_reservations / total_slots) if total_slots else 0
 
@@ -75,14 +99,22 @@ class DailySummaryView(APIView):
 
     def get(self, request):
         today = now().date()
-        summary = []
+        first_day = today - timedelta(days=6)
 
+        totals = dict(
+            DailyLocationStats.objects
+            .filter(date__gte=first_day, date__lte=today)
+            .values('date')
+            .annotate(total=Sum('reservations'))
+            .values_list('date', 'total')
+        )
+
+        summary = []
         for i in range(7):
             day = today - timedelta(days=i)
-            count = Reservation.objects.filter(start_time__date=day).count()
             summary.append({
                 "date": day,
-                "total_reservations": count
+                "total_reservations": totals.get(day, 0)
             })
 
         return Response(summary[::-1])  # Reverse to show oldest to newest
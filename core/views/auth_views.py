@@ -2,7 +2,9 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from django.contrib.auth.models import User
 from core.serializers import RegisterSerializer, UserSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from core.revocation import FilteredRefreshToken
 from rest_framework.views import APIView
 
 
@@ -25,7 +27,8 @@ class ProfileView(generics.RetrieveAPIView):
     serializer_class = UserSerializer
 
     def get_object(self):
-        return self.request.user
+        # request.user only carries token claims; load the full row
+        return User.objects.get(pk=self.request.user.pk)
 
 
 class ProfileUpdateView(generics.UpdateAPIView):
@@ -38,7 +41,8 @@ class ProfileUpdateView(generics.UpdateAPIView):
     serializer_class = UserSerializer
 
     def get_object(self):
-        return self.request.user
+        # request.user only carries token claims; load the full row
+        return User.objects.get(pk=self.request.user.pk)
 
 class ChangePasswordView(APIView):
     """
@@ -49,7 +53,7 @@ class ChangePasswordView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def put(self, request):
-        user = request.user
+        user = User.objects.get(pk=request.user.pk)
         current = request.data.get("current_password")
         new = request.data.get("new_password")
 
@@ -65,13 +69,33 @@ class ChangePasswordView(APIView):
 
         # Invalidate current refresh token (logout)
         try:
-            refresh_token = request.data.get("refresh")
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(request.data.get("refresh") or "")
+        except TokenError:
+            pass  # Not sent, malformed or already expired: nothing left to revoke
+        else:
             token.blacklist()
-        except Exception:
-            pass  # Token may already be expired or not sent, ignore silently
 
         return Response(
             {"detail": "Password updated successfully. Please log in again."},
             status=status.HTTP_200_OK,
-        )
\ No newline at end of file
+        )
+
+
+class LogoutView(APIView):
+    """
+    Revokes the caller's refresh token, so it can no longer be used at token/refresh/.
+    Accepts: refresh
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        try:
+            token = FilteredRefreshToken(request.data.get("refresh") or "")
+        except TokenError:
+            return Response({"detail": "Invalid or expired refresh token."}, status=400)
+
+        if str(token.payload.get(jwt_settings.USER_ID_CLAIM)) != str(request.user.pk):
+            return Response({"detail": "Refresh token does not belong to this user."}, status=400)
+
+        token.blacklist()
+        return Response({"detail": "Logged out."}, status=status.HTTP_200_OK)
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound, StreamingHttpResponse
+from django.views import View
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.authentication import ClaimsJWTAuthentication, account_states
+from core.events import events_since, hub, relay
+from core.models import ParkingLocation
+
+# Seconds between keep-alive comments, so proxies do not close idle streams.
+# The account state is re-checked on the same wall-clock schedule, busy or idle.
+KEEPALIVE_SECONDS = 15
+UNAUTHORIZED_EVENT = "event: unauthorized\ndata: {}\n\n"
+
+
+class LocationEventStreamView(View):
+    """
+    Authenticated (access token in ?token=, since EventSource cannot send headers):
+    GET: Server-Sent Events stream of slot and reservation changes for one location.
+    The token is checked like any API request (ClaimsJWTAuthentication). The stream ends
+    once it expires (checked before each event) or the account is deactivated (re-checked
+    every KEEPALIVE_SECONDS, however busy the stream is).
+    Any user may watch an existing location's slots, as with the slot list; reservation
+    events are only sent to staff and to the reservation's owner, as with reservation views.
+    Each event carries an `id:`; a reconnecting client's Last-Event-ID replays what it missed.
+    Requires ASGI (smart_parking_backend/asgi.py): under WSGI each open stream would
+    hold a worker, so it is refused unless DEBUG is on (runserver).
+    URL: /api/events/locations/<location_id>/
+    """
+
+    async def get(self, request, location_id):
+        if not isinstance(request, ASGIRequest) and not settings.DEBUG:
+            return HttpResponse("Live events are only served by the ASGI application.", status=503)
+
+        authentication = ClaimsJWTAuthentication()
+        try:
+            token = authentication.get_validated_token(request.GET.get("token", "").encode())
+            user = await sync_to_async(authentication.get_user)(token)
+        except AuthenticationFailed:  # Includes InvalidToken
+            return HttpResponseForbidden("Invalid or expired token.")
+        if not await ParkingLocation.objects.filter(pk=location_id).aexists():
+            return HttpResponseNotFound("Parking location not found.")
+
+        last_event_id = request.headers.get("Last-Event-ID", "")
+        response = StreamingHttpResponse(
+            self.stream(
+                location_id, user.id, user.is_staff, token.get("exp"),
+                int(last_event_id) if last_event_id.isdigit() else None,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # Disable proxy buffering (nginx)
+        return response
+
+    async def stream(self, location_id, user_id, is_staff, expires_at, last_event_id):
+        subscriber = hub.subscribe(location_id)
+        relay.ensure_running()
+        _, queue = subscriber
+        try:
+            yield "retry: 5000\n\n"
+            replayed = set()
+            if last_event_id is not None:
+                for event in await sync_to_async(events_since)(location_id, last_event_id):
+                    replayed.add(event["event_id"])
+                    if self.visible(event, user_id, is_staff):
+                        yield self.format(event)
+
+            next_check = time.monotonic() + KEEPALIVE_SECONDS
+            while True:
+                timeout = next_check - time.monotonic()
+                if expires_at is not None:
+                    timeout = min(timeout, expires_at - time.time())
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=max(0, timeout))
+                except asyncio.TimeoutError:
+                    event = None
+
+                if expires_at is not None and time.time() >= expires_at:
+                    yield UNAUTHORIZED_EVENT
+                    return
+                if time.monotonic() >= next_check:
+                    state = await sync_to_async(account_states.get)(user_id)
+                    if not state.is_active:
+                        yield UNAUTHORIZED_EVENT
+                        return
+                    is_staff = state.is_staff
+                    next_check = time.monotonic() + KEEPALIVE_SECONDS
+                    if event is None:
+                        yield ": keep-alive\n\n"
+
+                if event is None or event.get("event_id") in replayed:
+                    continue
+                if self.visible(event, user_id, is_staff):
+                    yield self.format(event)
+        finally:
+            hub.unsubscribe(location_id, subscriber)
+
+    @staticmethod
+    def visible(event, user_id, is_staff):
+        return is_staff or event["type"] != "reservation" or event.get("user") == user_id
+
+    @staticmethod
+    def format(event):
+        event_id = event.get("event_id")
+        prefix = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{prefix}event: {event['type']}\ndata: {json.dumps(event)}\n\n"
@@ -3,20 +3,32 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 
-from core.models import ParkingLocation, ParkingSlot, Reservation
+from core.models import ParkingLocation, Reservation
 from core.serializers import (
     ParkingLocationSerializer,
+    ParkingLocationShortSerializer,
     ParkingLocationWithSlotsSerializer,
     ReservationSerializer,
+    to_columnar,
+    wants_compact,
 )
+from core.availability import free_slot_counts, parse_window
+from core.cache import VersionedCacheMixin
+from core.fast_serializers import FastReadSerializer
+from core.pagination import ReservationCursorPagination
+from core.filters import filter_reservations
+from core.geo import bounding_box, haversine_km
 
+DEFAULT_NEARBY_RADIUS_KM = 5.0
+MAX_NEARBY_RADIUS_KM = 50.0
 
-class ParkingLocationListCreateView(generics.ListCreateAPIView):
+
+class ParkingLocationListCreateView(VersionedCacheMixin, generics.ListCreateAPIView):
     """
-    GET: Public – List all parking locations.
+    GET: Public – List all parking locations (cached, ETag-aware).
     POST: Admin only – Create a new parking location.
     """
-    queryset = ParkingLocation.objects.all()
+    queryset = ParkingLocation.objects.prefetch_related(ParkingLocationSerializer.slot_ids_prefetch())
     serializer_class = ParkingLocationSerializer
 
     def get_permissions(self):
@@ -25,13 +37,14 @@ class ParkingLocationListCreateView(generics.ListCreateAPIView):
         return [permissions.AllowAny()]
 
 
-class ParkingLocationDetailView(generics.RetrieveAPIView):
+class ParkingLocationDetailView(VersionedCacheMixin, generics.RetrieveAPIView):
     """
-    GET: Public – Retrieve a specific location with associated slots.
+    GET: Public – Retrieve a specific location with associated slots (cached, ETag-aware).
     """
-    queryset = ParkingLocation.objects.all()
+    queryset = ParkingLocation.objects.prefetch_related("parkingslot_set")
     serializer_class = ParkingLocationWithSlotsSerializer
     permission_classes = [permissions.AllowAny]
+    cache_scope_kwarg = 'pk'
 
     # NOTE: Deletion logic moved to a dedicated admin-only view.
     # If needed, safely move destroy logic to a RetrieveUpdateDestroyView elsewhere.
@@ -46,25 +59,103 @@ class ParkingLocationSearchView(APIView):
 
     def get(self, request):
         query = request.query_params.get("q", "")
-        locations = ParkingLocation.objects.filter(name__icontains=query)
+        locations = (
+            ParkingLocation.objects
+            .filter(name__icontains=query)
+            .prefetch_related(ParkingLocationSerializer.slot_ids_prefetch())
+        )
         serializer = ParkingLocationSerializer(locations, many=True)
         return Response(serializer.data)
 
 
-class LocationReservationsView(APIView):
+class ParkingLocationNearbyView(APIView):
+    """
+    GET: Parking locations within `radius` km of a point, nearest first.
+    If `start` and `end` are given, only locations with a free slot in that window are returned.
+    Example: /api/locations/nearby/?lat=14.55&lng=121.02&radius=3&start=...&end=...
+    Uses a lat/lng bounding-box index prefilter, then an exact haversine check.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            lat = float(params["lat"])
+            lng = float(params["lng"])
+            radius = float(params.get("radius", DEFAULT_NEARBY_RADIUS_KM))
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "lat and lng are required numbers; radius must be a number."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return Response({"error": "lat/lng out of range."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < radius <= MAX_NEARBY_RADIUS_KM:
+            return Response(
+                {"error": f"radius must be between 0 and {MAX_NEARBY_RADIUS_KM:g} km."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        window = None
+        if params.get("start") or params.get("end"):
+            try:
+                window = parse_window(params.get("start"), params.get("end"))
+            except ValueError as exc:
+                return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+        candidates = ParkingLocation.objects.filter(
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lng, max_lng),
+        )
+
+        nearby = []
+        for location in candidates:
+            distance = haversine_km(lat, lng, location.latitude, location.longitude)
+            if distance <= radius:
+                nearby.append((distance, location))
+
+        free_counts = None
+        if window and nearby:
+            free_counts = free_slot_counts([location.id for _, location in nearby], *window)
+            nearby = [(distance, location) for distance, location in nearby if location.id in free_counts]
+
+        nearby.sort(key=lambda item: item[0])
+
+        data = []
+        for distance, location in nearby:
+            item = ParkingLocationShortSerializer(location).data
+            item["distance_km"] = round(distance, 3)
+            if free_counts is not None:
+                item["free_slots"] = free_counts[location.id]
+            data.append(item)
+        return Response(data)
+
+
+class LocationReservationsView(generics.ListAPIView):
     """
     Admin only:
-    GET: List all reservations for a given parking location.
-    URL: /api/locations/<pk>/users/
+    GET: List reservations for a given parking location, one cursor page at a time.
+    Filters: ?status=, ?from=YYYY-MM-DD, ?to=YYYY-MM-DD
+    Payload: ?compact=1 (columnar rows, same shape as the other reservation lists)
+    URL: /api/locations/<pk>/reservations/
     """
+    serializer_class = ReservationSerializer
+    pagination_class = ReservationCursorPagination
     permission_classes = [permissions.IsAdminUser]
 
-    def get(self, request, pk):
-        location = get_object_or_404(ParkingLocation, pk=pk)
-        slots = ParkingSlot.objects.filter(location=location)
-        reservations = Reservation.objects.filter(slot__in=slots)
-        serializer = ReservationSerializer(reservations, many=True)
-        return Response(serializer.data)
+    def get_queryset(self):
+        location = get_object_or_404(ParkingLocation, pk=self.kwargs['pk'])
+        reservations = Reservation.objects.filter(slot__location=location)
+        return filter_reservations(reservations, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+        data = serializer.data
+        if wants_compact(request):
+            data = to_columnar(list(serializer.child.fields), data)
+        return self.get_paginated_response(data)
 
 
 class AdminLocationDashboardView(APIView):
@@ -72,13 +163,14 @@ class AdminLocationDashboardView(APIView):
     Admin only:
     GET: Return all locations with their associated slots.
     Used by admin panel for location-slot management.
+    Rendered by FastReadSerializer (one query for locations, one per 500 locations for slots);
+    JSON matches ParkingLocationWithSlotsSerializer.
     """
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        locations = ParkingLocation.objects.prefetch_related("parkingslot_set").all()
-        serializer = ParkingLocationWithSlotsSerializer(locations, many=True)
-        return Response(serializer.data)
+        fast = FastReadSerializer(ParkingLocationWithSlotsSerializer())
+        return Response(fast.serialize(ParkingLocation.objects.all()))
 
 
 class TestCORSView(APIView):
@@ -1,47 +1,208 @@
-from rest_framework import generics, status, permissions
+import csv
+import json
+import os
+import re
+from datetime import datetime
+
+from rest_framework import generics, serializers, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import APIException, PermissionDenied
 from django.utils.timezone import now
 from django.shortcuts import get_object_or_404
-
-from core.models import Reservation, ParkingSlot
-from core.serializers import ReservationSerializer, ReservationListSerializer, ReservationAdminSerializer
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.files import File
+
+from core.models import Reservation, ReceiptUpload
+from core.serializers import (
+    ReservationSerializer,
+    ReservationListSerializer,
+    ReservationAdminSerializer,
+    to_columnar,
+    wants_compact,
+)
+from core.pagination import ReservationCursorPagination
+from core.fast_serializers import FastReadSerializer
+from core.receipts import RECEIPT_MAX_UPLOAD_BYTES, attach_receipt, discard_upload, upload_expired
+from core.filters import filter_reservations
+
+MAX_RECEIPT_CHUNK_BYTES = 4 * 1024 * 1024
+UPLOAD_STREAM_BLOCK_BYTES = 64 * 1024
+CONTENT_RANGE_PATTERN = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
 
 
 class ReservationCreateView(generics.CreateAPIView):
     """
-    Create a reservation for an available slot.
-    Automatically marks the slot as unavailable.
+    Create a reservation for a slot that is free in the requested window.
+    Availability is derived from overlapping reservations, so a slot can be
+    booked back-to-back across the day.
+    An optional Idempotency-Key header makes retries return the original reservation.
     """
     serializer_class = ReservationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_idempotency_key(self):
+        return self.request.headers.get('Idempotency-Key') or None
+
+    def get_existing_reservation(self):
+        key = self.get_idempotency_key()
+        if not key:
+            return None
+        return Reservation.objects.filter(user=self.request.user, idempotency_key=key).first()
+
+    def create(self, request, *args, **kwargs):
+        existing = self.get_existing_reservation()
+        if existing:
+            return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
+
+        try:
+            return super().create(request, *args, **kwargs)
+        except IntegrityError:
+            # A parallel retry with the same key committed first
+            existing = self.get_existing_reservation()
+            if existing is None:
+                raise
+            return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
+
     def perform_create(self, serializer):
-        reservation = serializer.save(user=self.request.user)
-        reservation.slot.is_available = False
-        reservation.slot.save()
+        serializer.save(user=self.request.user, idempotency_key=self.get_idempotency_key())
 
 
 class MyReservationsView(generics.ListAPIView):
     """
-    List all reservations of the authenticated user.
+    List the authenticated user's reservations, newest first, one cursor page at a time.
+    Filters: ?status=, ?location=, ?from=YYYY-MM-DD, ?to=YYYY-MM-DD
+    Payload: ?fields=, ?expand=location, ?compact=1 (columnar rows)
+    Response: {"next": <url|null>, "previous": <url|null>, "results": [...]}, like every cursor-paginated list;
+    with ?compact=1, "results" is {"fields": [...], "rows": [[...], ...]}.
     """
+    serializer_class = ReservationListSerializer
+    pagination_class = ReservationCursorPagination
     permission_classes = [permissions.IsAuthenticated]
 
-    def get(self, request):
-        reservations = Reservation.objects.filter(user=request.user).order_by('-created_at')
-        serializer = ReservationListSerializer(reservations, many=True)
-        return Response({"data": serializer.data})
+    def get_queryset(self):
+        reservations = Reservation.objects.filter(user=self.request.user).select_related("slot__location")
+        return filter_reservations(reservations, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+        data = serializer.data
+        if wants_compact(request):
+            data = to_columnar(list(serializer.child.fields), data)
+        return self.get_paginated_response(data)
 
 
 class AllReservationsView(generics.ListAPIView):
     """
-    Admin-only: View all reservations in the system.
+    Admin-only: View all reservations in the system, one cursor page at a time.
+    Filters: ?status=, ?location=, ?from=YYYY-MM-DD, ?to=YYYY-MM-DD
+    Payload: ?fields=, ?expand=user,slot, ?compact=1 (columnar rows)
+    Rendered by FastReadSerializer from .values() rows; JSON matches ReservationAdminSerializer.
     """
-    queryset = Reservation.objects.select_related("user", "slot", "slot__location").all()
     serializer_class = ReservationAdminSerializer
+    pagination_class = ReservationCursorPagination
     permission_classes = [permissions.IsAdminUser]
 
+    def get_queryset(self):
+        reservations = Reservation.objects.all()
+        return filter_reservations(reservations, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()  # Bound fields already honour ?fields= / ?expand=
+        fast = FastReadSerializer(serializer)
+        ordering = self.paginator.ordering
+        keys = fast.keys + [field.lstrip('-') for field in ordering]
+
+        rows = self.paginate_queryset(self.get_queryset().values(*keys))
+        data = fast.render(rows)
+        if wants_compact(request):
+            data = to_columnar(list(serializer.fields), data)
+        return self.get_paginated_response(data)
+
+
+
+class Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer rows can be streamed.
+    """
+    def write(self, value):
+        return value
+
+
+class ReservationExportView(APIView):
+    """
+    Admin-only: Stream reservations as CSV or NDJSON for finance reconciliation.
+    Query: ?output=csv|ndjson (default csv), plus ?status=, ?location=, ?from=, ?to=
+    Rows are read with a server-side iterator over a values() projection,
+    so memory stays constant and bytes start flowing immediately.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    EXPORT_FIELDS = [
+        'id',
+        'user_id',
+        'user__username',
+        'slot__slot_id',
+        'slot__location_id',
+        'slot__location__name',
+        'start_time',
+        'end_time',
+        'last_park_in',
+        'last_park_out',
+        'status',
+        'vehicle_make',
+        'vehicle_model',
+        'plate_number',
+        'vehicle_type',
+        'created_at',
+    ]
+    CHUNK_SIZE = 2000
+    # Both formats render datetimes exactly like the API's JSON (DRF ISO 8601, UTC as "Z")
+    DATETIME_FIELD = serializers.DateTimeField()
+
+    def get(self, request):
+        output = request.query_params.get("output", "csv")
+        if output not in ("csv", "ndjson"):
+            return Response({"error": "output must be 'csv' or 'ndjson'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        reservations = filter_reservations(Reservation.objects.all(), request.query_params)
+        rows = (
+            reservations
+            .order_by('created_at', 'id')
+            .values_list(*self.EXPORT_FIELDS)
+            .iterator(chunk_size=self.CHUNK_SIZE)
+        )
+
+        if output == "csv":
+            content = self.stream_csv(rows)
+            content_type = "text/csv"
+        else:
+            content = self.stream_ndjson(rows)
+            content_type = "application/x-ndjson"
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        filename = f"reservations-{now():%Y%m%d-%H%M%S}.{output}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def export_values(self, row):
+        return [
+            self.DATETIME_FIELD.to_representation(value) if isinstance(value, datetime) else value
+            for value in row
+        ]
+
+    def stream_csv(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.EXPORT_FIELDS)
+        for row in rows:
+            yield writer.writerow(self.export_values(row))
+
+    def stream_ndjson(self, rows):
+        for row in rows:
+            yield json.dumps(dict(zip(self.EXPORT_FIELDS, self.export_values(row))), cls=DjangoJSONEncoder) + "\n"
 
 
 class ReservationDetailView(generics.RetrieveAPIView):
@@ -55,7 +216,7 @@ class ReservationDetailView(generics.RetrieveAPIView):
 
 class ReservationDeleteView(generics.DestroyAPIView):
     """
-    Cancel a reservation and free up the associated slot.
+    Cancel a reservation, releasing its time window on the slot.
     Users can cancel their own; Admins can cancel any.
     """
     queryset = Reservation.objects.all()
@@ -66,8 +227,6 @@ class ReservationDeleteView(generics.DestroyAPIView):
         if reservation.user != request.user and not request.user.is_staff:
             return Response({"error": "Not authorized to delete this reservation."}, status=403)
 
-        reservation.slot.is_available = True
-        reservation.slot.save()
         reservation.delete()
 
         return Response({"message": "Reservation cancelled, slot marked available."}, status=200)
@@ -90,15 +249,12 @@ class ReservationCheckInView(APIView):
 class ReservationCheckOutView(APIView):
     """
     Mark check-out time for a reservation.
-    Frees up the associated slot.
     """
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, pk):
         reservation = get_object_or_404(Reservation, id=pk, user=request.user)
         reservation.last_park_out = now()
-        reservation.slot.is_available = True
-        reservation.slot.save()
         reservation.save()
         return Response({
             "message": "Check-out successful",
@@ -135,10 +291,6 @@ class ReservationStatusUpdateView(APIView):
         reservation.status = new_status
         reservation.save()
 
-        if new_status in ["Cancelled", "Complete"]:
-            reservation.slot.is_available = True
-            reservation.slot.save()
-
         return Response({
             "message": f"Status updated to '{new_status}'.",
             "status": reservation.status
@@ -149,6 +301,8 @@ class UploadReceiptView(APIView):
     """
     Upload a payment receipt for a reservation.
     Automatically sets status to 'Processing'.
+    Receipts are content-hashed: re-uploads of the same image reuse the stored file,
+    and new images are downscaled/recompressed in the background (core/receipts.py).
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -160,17 +314,141 @@ class UploadReceiptView(APIView):
         if 'receipt' not in request.FILES:
             return Response({'detail': 'No receipt uploaded.'}, status=400)
 
-        reservation.receipt = request.FILES['receipt']
-        reservation.status = 'Processing'
-        reservation.save()
+        if not attach_receipt(reservation, request.FILES['receipt']):
+            return Response({'detail': 'Receipt already uploaded.'}, status=200)
+
+        return Response({'detail': 'Receipt uploaded successfully.'}, status=200)
+
+
+class ReceiptUploadInitView(APIView):
+    """
+    Start a chunked, resumable receipt upload (for flaky mobile links).
+    POST body: {"filename": "...", "size": <total bytes>}
+    Then PUT byte ranges to /api/receipt-uploads/<upload_id>/ and POST .../finalize/.
+    Any unfinished upload for the same reservation is discarded. Uploads expire
+    RECEIPT_UPLOAD_TTL after they start (410 Gone; `runcrons` deletes abandoned ones).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk):
+        reservation = get_object_or_404(Reservation, pk=pk)
+        if reservation.user != request.user:
+            return Response({'detail': 'Not allowed.'}, status=403)
+
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'detail': 'size must be an integer.'}, status=400)
+        if not 0 < size <= RECEIPT_MAX_UPLOAD_BYTES:
+            return Response({'detail': f'size must be between 1 and {RECEIPT_MAX_UPLOAD_BYTES} bytes.'}, status=400)
+        filename = os.path.basename(str(request.data.get('filename') or 'receipt'))[:255]
+
+        for stale in ReceiptUpload.objects.filter(reservation=reservation):
+            discard_upload(stale)
+
+        upload = ReceiptUpload.objects.create(reservation=reservation, filename=filename, size=size)
+        os.makedirs(os.path.dirname(upload.part_path), exist_ok=True)
+        open(upload.part_path, 'wb').close()
+
+        return Response({'upload_id': upload.upload_id, 'offset': 0, 'size': size}, status=201)
+
+
+class UploadExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Upload expired; start a new one.'
+    default_code = 'upload_expired'
+
 
+class ReceiptUploadMixin:
+    def get_upload(self, request, upload_id):
+        upload = get_object_or_404(ReceiptUpload.objects.select_related('reservation'), upload_id=upload_id)
+        if upload.reservation.user_id != request.user.id:
+            raise PermissionDenied('Not allowed.')
+        if upload_expired(upload):
+            discard_upload(upload)
+            raise UploadExpired()
+        return upload
+
+
+class ReceiptUploadChunkView(ReceiptUploadMixin, APIView):
+    """
+    GET: Current offset of a chunked upload, to resume after an interruption.
+    PUT: Append raw bytes with `Content-Range: bytes <start>-<end>/<size>`.
+         <start> must equal the current offset (409 with the offset otherwise).
+         The body is streamed to disk in blocks, so memory stays bounded.
+    URL: /api/receipt-uploads/<upload_id>/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        return Response({'upload_id': upload.upload_id, 'offset': upload.offset, 'size': upload.size})
+
+    def put(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+
+        match = CONTENT_RANGE_PATTERN.match(request.headers.get('Content-Range', ''))
+        if not match:
+            return Response({'detail': 'Content-Range: bytes <start>-<end>/<size> is required.'}, status=400)
+        start, end, total = (int(value) for value in match.groups())
+        if total != upload.size or end < start or end >= total:
+            return Response({'detail': 'Content-Range does not match this upload.'}, status=400)
+        length = end - start + 1
+        if length > MAX_RECEIPT_CHUNK_BYTES:
+            return Response({'detail': f'Chunks are limited to {MAX_RECEIPT_CHUNK_BYTES} bytes.'}, status=413)
+
+        with transaction.atomic():
+            # Serialize writers for the same upload
+            ReceiptUpload.objects.select_for_update().get(pk=upload.pk)
+            offset = upload.offset
+            if start != offset:
+                return Response({'detail': 'Chunk does not start at the current offset.', 'offset': offset}, status=409)
+
+            written = 0
+            with open(upload.part_path, 'r+b') as part:
+                part.seek(offset)
+                while written < length:
+                    block = request.stream.read(min(UPLOAD_STREAM_BLOCK_BYTES, length - written)) if request.stream else b''
+                    if not block:
+                        break
+                    part.write(block)
+                    written += len(block)
+                if written != length:
+                    part.truncate(offset)
+                    return Response({'detail': 'Incomplete chunk; resend it.', 'offset': offset}, status=400)
+
+        return Response({'upload_id': upload.upload_id, 'offset': offset + written, 'size': upload.size})
+
+
+class ReceiptUploadFinalizeView(ReceiptUploadMixin, APIView):
+    """
+    POST: Complete a chunked upload and attach it as the reservation's receipt
+    (same processing as UploadReceiptView).
+    URL: /api/receipt-uploads/<upload_id>/finalize/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        offset = upload.offset
+        if offset != upload.size:
+            return Response({'detail': 'Upload is incomplete.', 'offset': offset, 'size': upload.size}, status=409)
+
+        try:
+            with open(upload.part_path, 'rb') as part:
+                attached = attach_receipt(upload.reservation, File(part, name=upload.filename))
+        finally:
+            discard_upload(upload)  # Also when the file is rejected; the client starts over
+
+        if not attached:
+            return Response({'detail': 'Receipt already uploaded.'}, status=200)
         return Response({'detail': 'Receipt uploaded successfully.'}, status=200)
 
 
 class ApproveReservationView(APIView):
     """
     Admin: Approve a reservation that has a receipt and is in 'Processing' status.
-    Sets status to 'Reserved' and marks the slot as unavailable.
+    Sets status to 'Reserved'.
     """
     permission_classes = [permissions.IsAdminUser]
 
@@ -185,14 +463,9 @@ class ApproveReservationView(APIView):
         if not reservation.receipt:
             return Response({'detail': 'Cannot approve reservation without a receipt.'}, status=400)
 
-        # Mark slot as unavailable
-        slot = reservation.slot
-        if not slot:
+        if not reservation.slot:
             return Response({'detail': 'Reservation has no assigned slot.'}, status=400)
 
-        slot.is_available = False
-        slot.save()
-
         # Update reservation status
         reservation.status = "Reserved"
         reservation.save()
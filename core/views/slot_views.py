@@ -2,25 +2,76 @@ from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-
-from core.models import ParkingSlot, Reservation
-from core.serializers import ParkingSlotSerializer
-
-
-class ParkingSlotListView(generics.ListAPIView):
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils.timezone import now
+
+from core.models import ParkingLocation, ParkingSlot, Reservation
+from core.serializers import (
+    ParkingSlotSerializer,
+    ParkingSlotWithCurrentReservationSerializer,
+    SlotProvisionSerializer,
+)
+from core.availability import BLOCKING_STATUSES, available_slots, parse_window
+from core.events import publish_on_commit
+from core.cache import VersionedCacheMixin
+
+
+class ParkingSlotListView(VersionedCacheMixin, generics.ListAPIView):
     """
     Authenticated:
-    GET: List all parking slots for a specific location.
-    URL: /api/locations/<location_id>/slots/
+    GET: List all parking slots for a specific location (cached, ETag-aware).
+    URL: /api/slots/<location_id>/
     """
     serializer_class = ParkingSlotSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_scope_kwarg = 'location_id'
 
     def get_queryset(self):
         location_id = self.kwargs['location_id']
         return ParkingSlot.objects.filter(location_id=location_id)
 
 
+class AvailableSlotListView(APIView):
+    """
+    Authenticated:
+    GET: List slots at a location that are free for the [start, end) window.
+    URL: /api/slots/<location_id>/available/?start=<iso>&end=<iso>
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, location_id):
+        try:
+            start, end = parse_window(
+                request.query_params.get("start"),
+                request.query_params.get("end"),
+            )
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        slots = available_slots(location_id, start, end)
+        serializer = ParkingSlotSerializer(slots, many=True)
+        return Response(serializer.data)
+
+
+class SlotOccupancyListView(generics.ListAPIView):
+    """
+    Admin only:
+    GET: List slots at a location with the reservation currently parked in each.
+    Current reservations are prefetched, so the query count is constant per request.
+    URL: /api/slots/<location_id>/occupancy/
+    """
+    serializer_class = ParkingSlotWithCurrentReservationSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_queryset(self):
+        return (
+            ParkingSlot.objects
+            .filter(location_id=self.kwargs['location_id'])
+            .prefetch_related(ParkingSlotWithCurrentReservationSerializer.current_reservation_prefetch())
+        )
+
+
 class ParkingSlotCreateView(generics.CreateAPIView):
     """
     Admin only:
@@ -30,6 +81,93 @@ class ParkingSlotCreateView(generics.CreateAPIView):
     serializer_class = ParkingSlotSerializer
     permission_classes = [permissions.IsAdminUser]
 
+    def perform_create(self, serializer):
+        slot = serializer.save()
+        slot.location.sync_slot_count()
+
+
+class BulkSlotProvisionView(APIView):
+    """
+    Admin only:
+    POST: Create or retire many slots for a location in one transaction.
+    Body: {"action": "create"|"retire", "count": N, "prefix": "B1", "start": 1, "width": 3}
+    Reconciles ParkingLocation.slots with the real open slot count.
+    URL: /api/locations/<pk>/slots/bulk/
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, pk):
+        serializer = SlotProvisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        with transaction.atomic():
+            # Lock the location so concurrent provisioning requests cannot interleave
+            location = get_object_or_404(ParkingLocation.objects.select_for_update(), pk=pk)
+
+            if data['action'] == 'create':
+                changed = self.create_slots(location, data)
+            else:
+                changed = self.retire_slots(location, data)
+
+            location.sync_slot_count()
+            # Bulk writes skip model signals, so notify live clients explicitly
+            publish_on_commit(location.id, {"type": "slots_changed", "location": location.id, "slots": location.slots})
+
+        return Response({
+            "action": data['action'],
+            "requested": data['count'],
+            "changed": changed,
+            "slots": location.slots,
+        }, status=status.HTTP_200_OK)
+
+    def create_slots(self, location, data):
+        labels = [
+            SlotProvisionSerializer.slot_label(data['prefix'], number, data['width'])
+            for number in range(data['start'], data['start'] + data['count'])
+        ]
+        existing = {
+            slot.floorzone_number: slot
+            for slot in ParkingSlot.objects.filter(
+                location=location,
+                floorzone_number__startswith=data['prefix'],
+            ).only('id', 'floorzone_number', 'is_available')
+        }
+
+        reopened = []
+        new_slots = []
+        for label in labels:
+            slot = existing.get(label)
+            if slot is None:
+                new_slots.append(ParkingSlot(location=location, floorzone_number=label))
+            elif not slot.is_available:
+                slot.is_available = True
+                reopened.append(slot)
+
+        ParkingSlot.objects.bulk_create(new_slots, batch_size=500)
+        ParkingSlot.objects.bulk_update(reopened, ['is_available'], batch_size=500)
+        return len(new_slots) + len(reopened)
+
+    def retire_slots(self, location, data):
+        upcoming = Reservation.objects.filter(
+            slot=OuterRef('pk'),
+            status__in=BLOCKING_STATUSES,
+            end_time__gt=now(),
+        )
+        candidates = list(
+            ParkingSlot.objects
+            .filter(location=location, is_available=True, floorzone_number__startswith=data['prefix'])
+            .annotate(has_upcoming=Exists(upcoming))
+            .filter(has_upcoming=False)
+            .order_by('-floorzone_number', '-id')
+            .only('id', 'is_available')[:data['count']]
+        )
+
+        for slot in candidates:
+            slot.is_available = False
+        ParkingSlot.objects.bulk_update(candidates, ['is_available'], batch_size=500)
+        return len(candidates)
+
 
 class ParkingSlotUpdateView(generics.UpdateAPIView):
     """
@@ -40,6 +178,13 @@ class ParkingSlotUpdateView(generics.UpdateAPIView):
     serializer_class = ParkingSlotSerializer
     permission_classes = [permissions.IsAdminUser]
 
+    def perform_update(self, serializer):
+        previous_location = serializer.instance.location
+        slot = serializer.save()
+        slot.location.sync_slot_count()
+        if previous_location.pk != slot.location_id:
+            previous_location.sync_slot_count()
+
 
 class ParkingSlotDeleteView(generics.DestroyAPIView):
     """
@@ -61,6 +206,11 @@ class ParkingSlotDeleteView(generics.DestroyAPIView):
 
         return super().delete(request, *args, **kwargs)
 
+    def perform_destroy(self, instance):
+        location = instance.location
+        instance.delete()
+        location.sync_slot_count()
+
 
 class LockSlotView(APIView):
     """
@@ -0,0 +1,61 @@
+from django.http import FileResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from rest_framework import status
+
+from core.metrics import registry
+from core.profiling import list_profiles, profile_path
+
+
+class RequestMetricsView(APIView):
+    """
+    Admin-only:
+    GET: Per-view request metrics for the serving process: wall time, DB time and
+         query-count histograms (p50/p95/p99 estimated from buckets), response bytes
+         and status codes. Each worker process reports only its own requests (see `pid`).
+    DELETE: Reset this process's metrics.
+    URL: /api/system/metrics/
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(registry.snapshot())
+
+    def delete(self, request):
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileListView(APIView):
+    """
+    Admin-only:
+    GET: Stored request profiles, newest first (optional ?view=<url name> filter).
+         Record one by sending `X-Profile: cprofile` or `X-Profile: sample` as an admin.
+    URL: /api/system/profiles/
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        profiles = list_profiles()
+        view = request.query_params.get("view")
+        if view:
+            profiles = [profile for profile in profiles if profile["view"] == view]
+        return Response(profiles)
+
+
+class ProfileDownloadView(APIView):
+    """
+    Admin-only:
+    GET: Download one stored profile: .prof (pstats / snakeviz), .txt (cumulative-time
+         summary) or .folded (stack samples for flamegraph.pl / speedscope).
+    URL: /api/system/profiles/<profile_id>/
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        path = profile_path(profile_id)
+        if path is None:
+            return Response({"error": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
+        content_type = "application/octet-stream" if profile_id.endswith(".prof") else "text/plain"
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=profile_id, content_type=content_type)
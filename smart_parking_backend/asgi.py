@@ -3,6 +3,13 @@ ASGI config for smart_parking_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+This is the production entrypoint. Serve it with ASGI workers so the live event
+streams (/api/events/...) hold no worker thread while idle; they are refused under
+WSGI outside DEBUG. Any number of workers is fine: each one relays the shared
+LiveEvent log to its own clients (core/events.py). E.g.:
+
+    gunicorn smart_parking_backend.asgi:application -k uvicorn.workers.UvicornWorker -w 4
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
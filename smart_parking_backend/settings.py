@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 from pathlib import Path
 from dotenv import load_dotenv
 from pathlib import Path
@@ -35,10 +36,22 @@ DEBUG = os.getenv("DEBUG", "False") == "True"
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Builds request.user from token claims, no per-request User query
+        'core.authentication.ClaimsJWTAuthentication',
     )
 }
 
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'core.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'core.serializers.FilteredTokenRefreshSerializer',
+}
+
+# Seconds before a refresh token revoked by another process is seen by this one
+REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "10"))
+
+# Seconds the stateless JWT auth trusts a cached user active/deactivated state
+ACCOUNT_STATE_TTL = int(os.getenv("ACCOUNT_STATE_TTL", "30"))
+
 
 # Application definition
 
@@ -51,11 +64,20 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'django_extensions',
     'rest_framework',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'core',
     'django_cron',
 ]
 
+# Scheduled jobs run by `python manage.py runcrons` (call it every few minutes)
+CRON_CLASSES = [
+    'core.cron.OverdueReservationCronJob',
+    'core.cron.PruneExpiredTokensCronJob',
+    'core.cron.PruneLiveEventsCronJob',
+    'core.cron.PruneExpiredUploadsCronJob',
+]
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -65,7 +87,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.ProfilingMiddleware',  # Must stay last: it calls the view itself
 ]
 
 ROOT_URLCONF = 'smart_parking_backend.urls'
@@ -87,6 +110,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'smart_parking_backend.wsgi.application'
+# Production entrypoint: the live event streams (/api/events/...) are refused under WSGI
+ASGI_APPLICATION = 'smart_parking_backend.asgi.application'
+
+# Seconds between polls of the live event log while a process has SSE clients
+EVENT_POLL_SECONDS = float(os.getenv("EVENT_POLL_SECONDS", "1"))
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -94,13 +122,73 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# DB_PROFILE selects the connection setup:
+#   postgres   DATABASE_URL over SSL, persistent connections with health checks
+#   pgbouncer  DATABASE_URL points at a local pgbouncer in transaction pooling mode;
+#              the pooling option on Django 4.2 (in-process pools need Django 5.1+)
+#   sqlite     local SQLite in WAL mode, for development and benchmarking
+# Defaults to postgres when DATABASE_URL is set, sqlite otherwise.
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+DB_PROFILE = os.getenv("DB_PROFILE", "postgres" if DATABASE_URL else "sqlite")
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "600"))
+SQLITE_WAL = False  # Applied per connection by core/db.py
+
+if DB_PROFILE == "sqlite":
+    SQLITE_WAL = True
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv("SQLITE_PATH", BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,  # Same request-start check as the postgres profile
+            'OPTIONS': {'timeout': 20},  # Seconds to wait on the write lock
+            # A file, not the default shared in-memory database, so tests that run
+            # requests on several threads get WAL and the busy timeout too
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        }
+    }
+elif DB_PROFILE in ("postgres", "pgbouncer"):
+    if not DATABASE_URL:
+        raise ImproperlyConfigured(f"DB_PROFILE={DB_PROFILE} requires DATABASE_URL.")
+    DATABASES = {
+        'default': dj_database_url.parse(
+            DATABASE_URL,
+            conn_max_age=DB_CONN_MAX_AGE,
+            # Test reused connections before the first query of a request, so a
+            # connection dropped by the server or a proxy is replaced instead of failing
+            conn_health_checks=True,
+            # A local pgbouncer sits next to the app: no TLS on that hop
+            ssl_require=DB_PROFILE == "postgres" and os.getenv("DB_SSL_REQUIRE", "True") == "True",
+            # Transaction pooling hands each transaction a different server connection,
+            # which breaks server-side cursors
+            disable_server_side_cursors=DB_PROFILE == "pgbouncer",
+        )
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown DB_PROFILE '{DB_PROFILE}'.")
+
+
+# Cache
+# Used by the versioned read cache (core/cache.py).
+# CACHE_BACKEND=locmem (default, per process) or file (shared by all gunicorn workers on a host).
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+if CACHE_BACKEND == "file":
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv("CACHE_LOCATION", os.path.join(BASE_DIR, 'cache')),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'smart-parking',
+        }
     }
-}
 
 
 # Password validation
@@ -167,8 +255,13 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
     'access-control-allow-origin',
     'access-control-allow-credentials',
     'authorization',
+    'idempotency-key',
+    'content-range',
+    'x-profile',
 ]
 
+CORS_EXPOSE_HEADERS = ['x-profile-id']
+
 CORS_ALLOW_METHODS = [
     'DELETE',
     'GET',
@@ -178,17 +271,40 @@ CORS_ALLOW_METHODS = [
     'PUT',
 ]
 
+# Requests slower than this (ms) are logged to core.slow_requests with their top SQL
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+
+# Opt-in profiling (core/profiling.py): fraction of requests profiled at random, 0 = header-only
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, 'profiles'))
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "plain": {
+            "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
+        },
+    },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
+            "formatter": "plain",
         },
     },
     "root": {
         "handlers": ["console"],
-        "level": "DEBUG",
+        "level": "WARNING",
+    },
+    "loggers": {
+        "core": {
+            "level": LOG_LEVEL,
+        },
+        "django.request": {
+            "level": "WARNING",
+        },
     },
 }
 
@@ -198,7 +314,3 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
-
-DATABASES = {
-    'default': dj_database_url.config(conn_max_age=600, ssl_require=True)
-}
\ No newline at end of file
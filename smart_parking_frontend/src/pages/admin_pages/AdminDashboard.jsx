@@ -20,9 +20,9 @@ const AdminDashboard = () => {
       .catch((err) => console.error("Summary error:", err));
 
     axiosInstance
-      .get("/api/reservations/all/")
+      .get("/api/reservations/all/", { params: { page_size: 5 } })
       .then((res) => {
-        const sorted = res.data
+        const sorted = res.data.results
           .filter((r) => r.created_at)
           .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))
           .slice(0, 5);
@@ -1,16 +1,27 @@
 import React, { useEffect, useState } from "react";
 import axiosInstance from "../../services/axios";
+import { fetchAllPages, fetchPage } from "../../services/pagination";
 
 const AdminReservationManagement = () => {
   const [reservations, setReservations] = useState([]);
+  const [processing, setProcessing] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [approvingIds, setApprovingIds] = useState(new Set());
 
+  // The table shows one cursor page at a time ("Load more" follows `next`);
+  // the approval panel needs every Processing reservation, so it walks all pages of that filter.
   const fetchReservations = async () => {
     setLoading(true);
     try {
-      const res = await axiosInstance.get("/api/reservations/all/");
-      setReservations(res.data);
+      const [page, pending] = await Promise.all([
+        fetchPage("/api/reservations/all/"),
+        fetchAllPages("/api/reservations/all/", { status: "Processing" }),
+      ]);
+      setReservations(page.items);
+      setNextPage(page.next);
+      setProcessing(pending);
     } catch (error) {
       console.error("Failed to fetch reservations:", error);
     } finally {
@@ -18,12 +29,30 @@ const AdminReservationManagement = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextPage || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextPage);
+      setReservations((prev) => [...prev, ...page.items]);
+      setNextPage(page.next);
+    } catch (error) {
+      console.error("Failed to fetch more reservations:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const approveReservation = async (id) => {
     if (approvingIds.has(id)) return;
     setApprovingIds(new Set(approvingIds).add(id));
     try {
       await axiosInstance.post(`/api/reservations/${id}/approve/`);
-      await fetchReservations();
+      // Update in place so the pages loaded so far are kept
+      setReservations((prev) =>
+        prev.map((r) => (r.id === id ? { ...r, status: "Reserved" } : r))
+      );
+      setProcessing((prev) => prev.filter((r) => r.id !== id));
     } catch (error) {
       console.error("Failed to approve reservation:", error);
       alert("Failed to approve reservation.");
@@ -40,8 +69,7 @@ const AdminReservationManagement = () => {
 
   const now = new Date();
   const soonThreshold = 24 * 60 * 60 * 1000;
-  const needsApprovalSoon = reservations.filter((r) => {
-    if (r.status !== "processing") return false;
+  const needsApprovalSoon = processing.filter((r) => {
     const start = new Date(r.start_time);
     return start - now <= soonThreshold && start - now > 0;
   });
@@ -170,6 +198,17 @@ const AdminReservationManagement = () => {
             )}
           </tbody>
         </table>
+        {nextPage && (
+          <div className="text-center mt-4">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-indigo-600 hover:bg-indigo-700 text-white px-4 py-1 rounded text-sm disabled:opacity-50"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,19 +1,23 @@
 import { useEffect, useState } from "react";
 import axiosInstance from "../../services/axios";
+import { fetchPage } from "../../services/pagination";
 
 const AdminUserManagement = () => {
   const [users, setUsers] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [togglingUserId, setTogglingUserId] = useState(null);
   const [error, setError] = useState("");
 
-  // Fetch users from API
+  // Fetch the first page of users from API
   const fetchUsers = async () => {
     setLoading(true);
     setError("");
     try {
-      const res = await axiosInstance.get("/api/users/");
-      setUsers(res.data);
+      const page = await fetchPage("/api/users/");
+      setUsers(page.items);
+      setNextPage(page.next);
     } catch (err) {
       console.error("Error fetching users:", err);
       setError("Failed to load users. Please try again later.");
@@ -22,6 +26,22 @@ const AdminUserManagement = () => {
     }
   };
 
+  // Append the next cursor page
+  const loadMore = async () => {
+    if (!nextPage || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextPage);
+      setUsers((prev) => [...prev, ...page.items]);
+      setNextPage(page.next);
+    } catch (err) {
+      console.error("Error fetching more users:", err);
+      alert("Failed to load more users.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Toggle activation/deactivation
   const handleToggle = async (userId, isActive) => {
     const action = isActive ? "deactivate" : "reactivate";
@@ -34,7 +54,12 @@ const AdminUserManagement = () => {
     try {
       const endpoint = `/api/users/${userId}/${action}/`;
       await axiosInstance.post(endpoint);
-      await fetchUsers();
+      // Update the row in place so pages loaded so far are kept
+      setUsers((prev) =>
+        prev.map((user) =>
+          user.id === userId ? { ...user, is_active: !isActive } : user
+        )
+      );
     } catch (err) {
       console.error("Toggle error:", err);
       alert("Failed to update user status.");
@@ -77,6 +102,17 @@ const AdminUserManagement = () => {
               ))}
             </tbody>
           </table>
+          {nextPage && (
+            <div className="text-center mt-4">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="px-4 py-1 text-sm rounded text-white bg-indigo-600 hover:bg-indigo-700 transition disabled:opacity-50"
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -1,8 +1,11 @@
 import { useEffect, useState } from "react";
 import axiosInstance from "../../services/axios";
+import { fetchAllPages, fetchPage } from "../../services/pagination";
 import QuickActions from "../../components/QuickActions";
 import { useNavigate } from "react-router-dom";
 
+const RECENT_PAGE_SIZE = 10;
+
 const Dashboard = () => {
   const [reservations, setReservations] = useState([]);
   const [profile, setProfile] = useState({});
@@ -15,22 +18,20 @@ const Dashboard = () => {
   useEffect(() => {
     const getData = async () => {
       try {
-        const [res1, res2, res3] = await Promise.all([
-          axiosInstance.get("/api/reservations/me/"),
+        // /api/reservations/me/ is cursor-paginated: every Active reservation is
+        // walked page by page; recent activity only needs the newest page of each status.
+        const [active, complete, checkedOut, res2, res3] = await Promise.all([
+          fetchAllPages("/api/reservations/me/", { status: "Active" }),
+          fetchPage("/api/reservations/me/", { status: "Complete", page_size: RECENT_PAGE_SIZE }),
+          fetchPage("/api/reservations/me/", { status: "Checked-out", page_size: RECENT_PAGE_SIZE }),
           axiosInstance.get("/api/profile/"),
           axiosInstance.get("/api/locations/"),
         ]);
 
-        const all = Array.isArray(res1.data.data) ? res1.data.data : [];
-
-        // Separate active and recent (completed/checked-out) reservations
-        setReservations(all.filter((r) => r.status === "Active"));
+        setReservations(active);
 
         setRecent(
-          all
-            .filter(
-              (r) => r.status === "Complete" || r.status === "Checked-out"
-            )
+          [...complete.items, ...checkedOut.items]
             .sort(
               (a, b) =>
                 new Date(b.last_park_out || b.end_time) -
@@ -55,6 +55,43 @@ const MakeReservation = () => {
     fetchSlotDetails();
   }, [formData.location]);
 
+  // Ids of slots free for the chosen [start_time, end_time) window (null until both are set)
+  const [freeSlotIds, setFreeSlotIds] = useState(null);
+
+  // Ask the API which slots are free whenever the location or time window changes.
+  // A slot's is_available flag only says it is open for booking; whether it is free
+  // depends on the reservations overlapping the window.
+  useEffect(() => {
+    const { location, start_time, end_time } = formData;
+    if (!location || !start_time || !end_time || start_time >= end_time) {
+      setFreeSlotIds(null);
+      return;
+    }
+
+    let cancelled = false;
+    const fetchFreeSlots = async () => {
+      try {
+        const res = await axiosInstance.get(`/api/slots/${location}/available/`, {
+          params: { start: start_time, end: end_time },
+        });
+        if (cancelled) return;
+        const ids = new Set(res.data.map((slot) => slot.id));
+        setFreeSlotIds(ids);
+        // Drop a previously picked slot that is taken in the new window
+        setFormData((prev) => (ids.has(prev.slot) ? prev : { ...prev, slot: "" }));
+      } catch (error) {
+        console.error("Error fetching free slots:", error.response?.data || error.message);
+        if (!cancelled) setFreeSlotIds(new Set());
+      }
+    };
+    fetchFreeSlots();
+    return () => {
+      cancelled = true;
+    };
+  }, [formData.location, formData.start_time, formData.end_time]);
+
+  const isSlotFree = (slot) => freeSlotIds !== null && freeSlotIds.has(slot.id);
+
   // Handle text or select input changes
   const handleChange = (e) => {
     const { name, value } = e.target;
@@ -69,6 +106,10 @@ const MakeReservation = () => {
   // Submit reservation form
   const handleSubmit = async (e) => {
     e.preventDefault();
+    if (!formData.slot) {
+      alert("Please choose a free slot for this time window.");
+      return;
+    }
     try {
       const res = await axiosInstance.post("/api/reservations/", formData);
       // Redirect to payment page
@@ -114,6 +155,11 @@ const MakeReservation = () => {
               <label className="block mb-2 font-medium text-slate-700">
                 Available Slots
               </label>
+              {freeSlotIds === null && (
+                <p className="text-sm text-gray-500 mb-2">
+                  Choose a start and end time to see which slots are free.
+                </p>
+              )}
               <div className="grid grid-cols-4 gap-3 p-2 border border-gray-200 rounded bg-slate-100">
                 {selectedLocation.slots.map((slot) => (
                   <button
@@ -123,11 +169,11 @@ const MakeReservation = () => {
                     className={`text-sm py-2 rounded border shadow-sm ${
                       formData.slot === slot.id
                         ? "bg-indigo-800 text-white border-indigo-800"
-                        : slot.locked || !slot.is_available
+                        : !isSlotFree(slot)
                         ? "bg-gray-300 text-gray-500 cursor-not-allowed"
                         : "bg-white text-slate-900 hover:bg-indigo-100"
                     }`}
-                    disabled={slot.locked || !slot.is_available}
+                    disabled={!isSlotFree(slot)}
                   >
                     {`Slot-${slot.slot_id.slice(0, 6).toUpperCase()}`}
                   </button>
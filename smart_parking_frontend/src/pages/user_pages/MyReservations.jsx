@@ -1,30 +1,50 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import axiosInstance from "../../services/axios";
+import { fetchPage } from "../../services/pagination";
 import dayjs from "dayjs";
 
 const MyReservations = () => {
   const [reservations, setReservations] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [filterStatus, setFilterStatus] = useState("All");
   const navigate = useNavigate();
 
   useEffect(() => {
     const fetchReservations = async () => {
+      setLoading(true);
       try {
-        const response = await axiosInstance.get("/api/reservations/me/");
-        const data = response.data?.data;
-        setReservations(Array.isArray(data) ? data : []);
+        const params = filterStatus === "All" ? undefined : { status: filterStatus };
+        const page = await fetchPage("/api/reservations/me/", params);
+        setReservations(page.items);
+        setNextPage(page.next);
       } catch (error) {
         console.error("Error fetching reservations:", error.response?.data || error.message);
         setReservations([]);
+        setNextPage(null);
       } finally {
         setLoading(false);
       }
     };
 
     fetchReservations();
-  }, []);
+  }, [filterStatus]);
+
+  const loadMore = async () => {
+    if (!nextPage || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextPage);
+      setReservations((prev) => [...prev, ...page.items]);
+      setNextPage(page.next);
+    } catch (error) {
+      console.error("Error fetching more reservations:", error.response?.data || error.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const handleCancel = async (id) => {
     try {
@@ -192,6 +212,19 @@ const MyReservations = () => {
           </ul>
         )}
 
+        {/* Load More */}
+        {!loading && nextPage && (
+          <div className="text-center mb-6">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-white border border-indigo-800 text-indigo-800 px-4 py-2 rounded hover:bg-indigo-50 transition disabled:opacity-50"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
+
         {/* Add New */}
         <div className="text-right">
           <button
@@ -0,0 +1,30 @@
+import axiosInstance from './axios';
+
+// List endpoints (/api/reservations/me/, /api/reservations/all/, /api/users/, ...)
+// return one cursor page at a time: { next, previous, results: [...] }.
+// `next` / `previous` are absolute URLs (or null) carrying the cursor.
+
+const pageItems = (body) => (Array.isArray(body?.results) ? body.results : []);
+
+// Fetch one page: pass the endpoint path (+ params) for the first page,
+// or a `next` / `previous` URL returned by an earlier page.
+export const fetchPage = async (url, params) => {
+  const res = await axiosInstance.get(url, params ? { params } : undefined);
+  return {
+    items: pageItems(res.data),
+    next: res.data?.next ?? null,
+    previous: res.data?.previous ?? null,
+  };
+};
+
+// Walk every page by following `next`. Only for screens that need the complete
+// list; narrow it with filters (e.g. { status: 'Active' }) so it stays small.
+export const fetchAllPages = async (url, params) => {
+  let page = await fetchPage(url, params);
+  const items = [...page.items];
+  while (page.next) {
+    page = await fetchPage(page.next);
+    items.push(...page.items);
+  }
+  return items;
+};